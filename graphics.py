@@ -168,12 +168,21 @@ UNSUPPORTED_METHOD = "Object doesn't support operation"
 BAD_OPTION = "Illegal option value"
 DEAD_THREAD = "Graphics thread quit unexpectedly"
 
-_root = tk.Tk()
-_root.withdraw()
+_root = None  # created by _getRoot when the first window needs it
+
+
+def _getRoot():
+    # The hidden Tk root is only created on first use, so importing this
+    # module is cheap and works on machines without a display
+    global _root
+    if _root is None:
+        _root = tk.Tk()
+        _root.withdraw()
+    return _root
 
 
 def update():
-    _root.update()
+    _getRoot().update()
 
 
 ############################################################################
@@ -184,7 +193,7 @@ class GraphWin(tk.Canvas):
     """A GraphWin is a toplevel window for displaying graphics."""
 
     def __init__(self, title="Graphics Window", width=200, height=200, autoflush=True):
-        master = tk.Toplevel(_root)
+        master = tk.Toplevel(_getRoot())
         master.protocol("WM_DELETE_WINDOW", self.close)
         tk.Canvas.__init__(self, master, width=width, height=height)
         self.master.title(title)
@@ -201,9 +210,11 @@ class GraphWin(tk.Canvas):
         self._mouseCallback = None
         self.trans = None
         self.closed = False
+        self._batchDepth = 0
+        self._batchAutoflush = autoflush
         master.lift()
         if autoflush:
-            _root.update()
+            _getRoot().update()
 
     def __checkOpen(self):
         if self.closed:
@@ -237,7 +248,7 @@ class GraphWin(tk.Canvas):
 
     def __autoflush(self):
         if self.autoflush:
-            _root.update()
+            _getRoot().update()
 
     def plot(self, x, y, color="black"):
         """Set pixel (x,y) to the given color"""
@@ -258,6 +269,77 @@ class GraphWin(tk.Canvas):
         self.__checkOpen()
         self.update_idletasks()
 
+    def beginBatch(self):
+        """Start a batch: drawing, moving and reconfiguring objects no
+        longer updates the window until the matching commitBatch.
+        Batches may be nested, only the outermost commit flushes."""
+        if self._batchDepth == 0:
+            self._batchAutoflush = self.autoflush
+            self.autoflush = False
+        self._batchDepth = self._batchDepth + 1
+
+    def commitBatch(self):
+        """End a batch started with beginBatch and show all the
+        changes made during it with a single update"""
+        if self._batchDepth == 0:
+            raise GraphicsError("commitBatch without beginBatch")
+        self._batchDepth = self._batchDepth - 1
+        if self._batchDepth == 0:
+            self.autoflush = self._batchAutoflush
+            if not self.closed:
+                if self.autoflush:
+                    _getRoot().update()
+                else:
+                    self.update_idletasks()
+
+    def batch(self):
+        """Return a context manager around beginBatch/commitBatch:
+            with win.batch():
+                for bar in bars: bar.draw(win)"""
+        return _Batch(self)
+
+    def drawRectangles(self, coords, fill="", outline="black", width=1):
+        """Draw a Rectangle for every (x1, y1, x2, y2) in coords with one
+        update and return the Rectangle objects. fill and outline are a
+        color or a sequence with one color per rectangle."""
+        self.__checkOpen()
+        coords = list(coords)
+        fills = _perItem(fill, len(coords))
+        outlines = _perItem(outline, len(coords))
+        rects = []
+        for (x1, y1, x2, y2), color, edge in zip(coords, fills, outlines):
+            rect = Rectangle(Point(x1, y1), Point(x2, y2))
+            rect.config.update(fill=color, outline=edge, width=str(width))
+            xs1, ys1 = self.toScreen(x1, y1)
+            xs2, ys2 = self.toScreen(x2, y2)
+            rect.canvas = self
+            rect.id = self.create_rectangle(xs1, ys1, xs2, ys2, rect.config)
+            rects.append(rect)
+        self.__autoflush()
+        return rects
+
+    def drawTexts(self, points, texts, size=12, style="normal",
+                  face="helvetica", fill="black"):
+        """Draw a Text for every (x, y) in points and the matching string
+        in texts with one update and return the Text objects. fill is a
+        color or a sequence with one color per text."""
+        self.__checkOpen()
+        points = list(points)
+        texts = list(texts)
+        if len(points) != len(texts):
+            raise GraphicsError("points and texts differ in length")
+        fills = _perItem(fill, len(points))
+        labels = []
+        for (x, y), text, color in zip(points, texts, fills):
+            label = Text(Point(x, y), text)
+            label.config.update(fill=color, font=(face, size, style))
+            xs, ys = self.toScreen(x, y)
+            label.canvas = self
+            label.id = self.create_text(xs, ys, label.config)
+            labels.append(label)
+        self.__autoflush()
+        return labels
+
     def getMouse(self):
         """Wait for mouse click and return Point object representing
         the click"""
@@ -320,6 +402,31 @@ class GraphWin(tk.Canvas):
             self._mouseCallback(Point(e.x, e.y))
 
 
+class _Batch:
+    """Context manager returned by GraphWin.batch"""
+
+    def __init__(self, win):
+        self.win = win
+
+    def __enter__(self):
+        self.win.beginBatch()
+        return self.win
+
+    def __exit__(self, *exc_info):
+        self.win.commitBatch()
+        return False
+
+
+def _perItem(value, count):
+    # A single color string applies to every item, otherwise one per item
+    if isinstance(value, str):
+        return [value] * count
+    value = list(value)
+    if len(value) != count:
+        raise GraphicsError(BAD_OPTION)
+    return value
+
+
 class Transform:
     """Internal class for 2-D coordinate transformations"""
 
@@ -407,7 +514,7 @@ class GraphicsObject:
         self.canvas = graphwin
         self.id = self._draw(graphwin, self.config)
         if graphwin.autoflush:
-            _root.update()
+            _getRoot().update()
 
     def undraw(self):
         """Undraw the object (i.e. hide it). Returns silently if the
@@ -418,7 +525,7 @@ class GraphicsObject:
         if not self.canvas.isClosed():
             self.canvas.delete(self.id)
             if self.canvas.autoflush:
-                _root.update()
+                _getRoot().update()
         self.canvas = None
         self.id = None
 
@@ -438,7 +545,7 @@ class GraphicsObject:
                 y = dy
             self.canvas.move(self.id, x, y)
             if canvas.autoflush:
-                _root.update()
+                _getRoot().update()
 
     def _reconfig(self, option, setting):
         # Internal method for changing configuration of the object
@@ -451,7 +558,7 @@ class GraphicsObject:
         if self.canvas and not self.canvas.isClosed():
             self.canvas.itemconfig(self.id, options)
             if self.canvas.autoflush:
-                _root.update()
+                _getRoot().update()
 
     def _draw(self, canvas, options):
         """draws appropriate figure on canvas with options provided
@@ -689,7 +796,7 @@ class Entry(GraphicsObject):
         self.anchor = p.clone()
         # print self.anchor
         self.width = width
-        self.text = tk.StringVar(_root)
+        self.text = tk.StringVar(_getRoot())
         self.text.set("")
         self.fill = "gray"
         self.color = "black"
@@ -779,10 +886,10 @@ class Image(GraphicsObject):
         self.imageId = Image.idCount
         Image.idCount = Image.idCount + 1
         if len(pixmap) == 1:  # file name provided
-            self.img = tk.PhotoImage(file=pixmap[0], master=_root)
+            self.img = tk.PhotoImage(file=pixmap[0], master=_getRoot())
         else:  # width and height provided
             width, height = pixmap
-            self.img = tk.PhotoImage(master=_root, width=width, height=height)
+            self.img = tk.PhotoImage(master=_getRoot(), width=width, height=height)
 
     def _draw(self, canvas, options):
         p = self.anchor
@@ -0,0 +1,37 @@
+# Author: B.G Ranuga Gamage
+# Date: 3/12/2024
+# Student ID: 20231264
+
+import datetime
+import os
+
+from traffic_catalog import DatasetCatalog, DirectoryManifest
+
+DAY = datetime.date(2024, 6, 15)
+HEADER = "JunctionName,Date,timeOfDay\n"
+ROW = "Elm Avenue/Rabbit Road,15/06/2024,00:40:34\n"
+
+
+def test_row_count_follows_an_append_in_place(tmp_path):
+    path = tmp_path / "traffic_data15062024.csv"
+    path.write_text(HEADER + ROW * 101)
+    assert DatasetCatalog([str(tmp_path)]).row_count(DAY) == 101
+    directory_mtime = os.stat(tmp_path).st_mtime_ns
+    with open(path, "a") as file:
+        file.write(ROW * 101)
+    os.utime(tmp_path, ns=(directory_mtime, directory_mtime))  # only the file changed
+    catalog = DatasetCatalog([str(tmp_path)])
+    assert catalog.row_count(DAY) == 202
+    assert catalog.get(DAY)["size"] == path.stat().st_size
+    with open(path, "a") as file:
+        file.write(ROW)
+    assert catalog.row_count(DAY) == 203  # the same catalog sees it too
+
+
+def test_save_keeps_the_mtime_of_the_scan(tmp_path):
+    manifest = DirectoryManifest(str(tmp_path))
+    manifest.refresh()
+    (tmp_path / "traffic_data16062024.csv").write_text(HEADER + ROW)
+    manifest.save()  # a save after the scan must not hide the new file
+    assert manifest.refresh()
+    assert "traffic_data16062024.csv" in manifest.entries
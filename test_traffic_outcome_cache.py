@@ -0,0 +1,47 @@
+# Author: B.G Ranuga Gamage
+# Date: 3/12/2024
+# Student ID: 20231264
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import traffic_outcome_cache
+from traffic_outcome_cache import FINGERPRINTS_DIR, OutcomeCache
+
+
+def count_lines(file_path, digest):
+    with open(file_path, "rb") as file:
+        return {"lines": file.read().count(b"\n")}
+
+
+def process(directory, file_path):
+    return OutcomeCache(directory).outcomes(file_path, count_lines)
+
+
+def test_pool_workers_keep_every_fingerprint(tmp_path, monkeypatch):
+    paths = []
+    for day in range(3):
+        path = tmp_path / f"traffic_data1{day}062024.csv"
+        path.write_text("header\n" + "row\n" * (day + 1))
+        paths.append(str(path))
+    directory = str(tmp_path / "cache")
+    with ProcessPoolExecutor(max_workers=3) as pool:
+        results = list(pool.map(partial(process, directory), paths))
+    assert results == [{"lines": day + 2} for day in range(3)]
+    assert len(os.listdir(os.path.join(directory, FINGERPRINTS_DIR))) == 3
+
+    def no_hash(file_path):
+        raise AssertionError(f"{file_path} was hashed again")
+
+    monkeypatch.setattr(traffic_outcome_cache, "file_hash", no_hash)
+    assert [process(directory, path) for path in paths] == results
+
+
+def test_eviction_drops_the_evicted_fingerprints(tmp_path):
+    cache = OutcomeCache(str(tmp_path / "cache"), max_bytes=1)
+    for day in range(3):
+        path = tmp_path / f"traffic_data1{day}062024.csv"
+        path.write_text("header\n" * (day + 1))
+        cache.outcomes(str(path), count_lines)
+    assert not os.listdir(os.path.join(cache.directory, FINGERPRINTS_DIR))
@@ -0,0 +1,43 @@
+# Author: B.G Ranuga Gamage
+# Date: 3/12/2024
+# Student ID: 20231264
+
+from traffic_parallel import load_csv_file_parallel, split_byte_ranges
+from traffic_tokenizer import load_csv
+
+HEADER = (
+    "JunctionName,Date,timeOfDay,travel_Direction_in,travel_Direction_out,"
+    "Weather_Conditions,JunctionSpeedLimit,VehicleSpeed,VehicleType,elctricHybrid\n"
+)
+
+
+def write_day(path, rows=3000):
+    """A day whose junction names are quoted and span two lines."""
+    with open(path, "w", newline="") as file:
+        file.write(HEADER)
+        for row in range(rows):
+            name = '"Elm\nAvenue"' if row % 2 else "Elm Avenue/Rabbit Road"
+            seconds = row % 86400
+            time = f"{seconds // 3600:02}:{seconds // 60 % 60:02}:{seconds % 60:02}"
+            file.write(f"{name},15/06/2024,{time},N,S,Rain,30,{row % 60},Car,False\n")
+
+
+def test_split_points_skip_quoted_newlines(tmp_path):
+    path = tmp_path / "traffic_data15062024.csv"
+    write_day(path)
+    data = path.read_bytes()
+    for chunks in range(2, 40):
+        ranges = split_byte_ranges(str(path), chunks)
+        assert ranges[-1][1] == len(data)
+        for start, end in ranges:
+            assert data[start:end].count(b'"') % 2 == 0
+
+
+def test_parallel_load_matches_serial_load(tmp_path):
+    path = tmp_path / "traffic_data15062024.csv"
+    write_day(path)
+    serial = load_csv(str(path)).to_dict()
+    assert len(serial["JunctionName"]) == 3000
+    assert serial["JunctionName"][1] == "Elm\nAvenue"
+    for workers in (2, 3, 7):
+        assert load_csv_file_parallel(str(path), workers).to_dict() == serial
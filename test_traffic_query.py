@@ -0,0 +1,29 @@
+# Author: B.G Ranuga Gamage
+# Date: 3/12/2024
+# Student ID: 20231264
+
+from traffic_dataset import TrafficDataset
+from traffic_query import filter_rows, query
+
+TYPES = ["Bus", "Car", "Buggy", "Truck", "Bus", "Scooter", "Car", "Bus"]
+
+
+def vehicle_dataset():
+    """VehicleType is dictionary encoded and indexed, Vehicle is a plain str list."""
+    dataset = TrafficDataset(["VehicleType", "Vehicle"])
+    for vehicle_type in TYPES:
+        dataset.append_row([vehicle_type, vehicle_type])
+    return dataset
+
+
+def test_in_with_a_str_value_is_the_same_on_both_paths():
+    dataset = vehicle_dataset()
+    buses = [row for row, vehicle_type in enumerate(TYPES) if vehicle_type == "Bus"]
+    others = [row for row in range(len(TYPES)) if row not in buses]
+    for column in ("VehicleType", "Vehicle"):  # bitmap index, then residual scan
+        for op, expected in (("in", buses), ("not in", others)):
+            predicates = query(dataset).where(column, op, "Bus").predicates
+            assert filter_rows(dataset, predicates) == expected
+            assert query(dataset).where(column, op, "Bus").count().run() == {
+                "count": len(expected)
+            }
@@ -0,0 +1,21 @@
+# Author: B.G Ranuga Gamage
+# Date: 3/12/2024
+# Student ID: 20231264
+
+import random
+
+import pytest
+
+from traffic_vector import ordered_hour_count
+
+
+def test_hours_keep_their_first_seen_order():
+    np = pytest.importorskip("numpy")
+    generator = random.Random(7)
+    for length in (0, 1, 50, 5000):
+        hours = [generator.randrange(24) for _ in range(length)]
+        expected = {}
+        for hour in hours:
+            expected[hour] = expected.get(hour, 0) + 1
+        counted = ordered_hour_count(np.array(hours, dtype=np.uint8))
+        assert list(counted.items()) == list(expected.items())
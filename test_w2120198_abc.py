@@ -0,0 +1,36 @@
+# Author: B.G Ranuga Gamage
+# Date: 3/12/2024
+# Student ID: 20231264
+
+import csv
+
+from w2120198_abc import access_specific_data, load_csv_file
+
+HEADER = (
+    "JunctionName,Date,timeOfDay,travel_Direction_in,travel_Direction_out,"
+    "Weather_Conditions,JunctionSpeedLimit,VehicleSpeed,VehicleType,elctricHybrid\n"
+)
+
+
+def test_non_indexed_int_column_matches_string_values(tmp_path):
+    path = tmp_path / "traffic_data15062024.csv"
+    with open(path, "w") as file:
+        file.write(HEADER)
+        for row in range(40):
+            file.write(
+                f"Elm Avenue/Rabbit Road,15/06/2024,00:{row:02}:00,N,S,Rain,30,"
+                f"{row % 17},Car,{row % 3 == 0}\n"
+            )
+    with open(path, newline="") as file:
+        rows = list(csv.DictReader(file))
+    data = load_csv_file(str(path))
+    for column, values in (
+        ("VehicleSpeed", ["13"]),
+        ("VehicleSpeed", ["3", "16"]),
+        ("JunctionSpeedLimit", ["30"]),
+        ("timeOfDay", ["00:05:00"]),
+        ("elctricHybrid", ["True"]),
+    ):
+        expected = [idx for idx, row in enumerate(rows) if row[column] in values]
+        assert expected
+        assert access_specific_data(data, column, values) == expected
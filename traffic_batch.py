@@ -0,0 +1,130 @@
+# Author: B.G Ranuga Gamage
+# Date: 3/12/2024
+# Student ID: 20231264
+
+import argparse
+import datetime
+import functools
+import glob
+import os
+import re
+
+from traffic_catalog import DatasetCatalog, date_of_name
+from traffic_parallel import should_parallelise
+from w2120198_abc import (
+    format_outcomes,
+    get_csv_file_name,
+    process_csv_data,
+    save_results_record,
+    save_results_to_file,
+)
+
+
+def parse_date(text: str) -> datetime.date:
+    """Parses DD/MM/YYYY, DD-MM-YYYY, "DD MM YYYY" or DDMMYYYY."""
+    digits = re.sub(r"[/\-. ]", "", text)
+    if not digits.isnumeric() or len(digits) != 8:
+        raise argparse.ArgumentTypeError(f"invalid date: {text!r}")
+    try:
+        return datetime.date(int(digits[4:]), int(digits[2:4]), int(digits[:2]))
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(f"invalid date: {text!r} ({error})")
+
+
+def collect_files(
+    dates=(), start=None, end=None, patterns=(), directory="./", verbose=True
+) -> list:
+    """
+    Resolves dates, an optional start/end range and glob patterns into a
+    sorted list of (date, file path) pairs using the dataset catalog of the
+    directory. Requested dates without a file are skipped (and reported when
+    verbose).
+    """
+    catalog = DatasetCatalog([directory])
+    found = {}
+    for date in sorted(set(dates)):
+        entry = catalog.get(date)
+        if entry is not None:
+            found[date] = entry["path"]
+        elif verbose:
+            file_name = get_csv_file_name(date.day, date.month, date.year)
+            print(f"Skipping {date:%d/%m/%Y}: {file_name} not found")
+    if start is not None:
+        for date, entry in catalog.between(start, end or start):
+            found[date] = entry["path"]
+    for pattern in patterns:
+        for file_path in glob.glob(os.path.join(directory, pattern)):
+            date = date_of_name(os.path.basename(file_path))
+            if date is not None:
+                found.setdefault(date, file_path)
+    return sorted(found.items())  # deterministic, date ordered
+
+
+def run_batch(files: list, results_file: str = "results.txt", workers: int = None):
+    """
+    Runs process_csv_data for every file on a process pool and appends the
+    outcomes to the results file in the order of `files`.
+    """
+    paths = [file_path for _, file_path in files]
+
+    def save(date, file_path, outcomes):
+        save_results_to_file(format_outcomes(outcomes), results_file)
+        save_results_record(date.day, date.month, date.year, file_path, outcomes)
+        print(f"Processed {file_path}")
+
+    workers = workers or os.cpu_count() or 1
+    if (
+        workers == 1
+        or len(paths) < 2
+        or len(paths) < workers
+        and any(should_parallelise(path, workers) for path in paths)
+    ):  # one file at a time, large ones parsed in chunks on all the workers
+        for date, file_path in files:
+            save(date, file_path, process_csv_data(file_path, workers))
+        return len(paths)
+    from concurrent.futures import ProcessPoolExecutor  # loaded only for a pool
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # map yields in submission order, so the results file stays sorted;
+        # every worker parses its own files on a single core
+        for (date, file_path), outcomes in zip(
+            files, pool.map(functools.partial(process_csv_data, workers=1), paths)
+        ):
+            save(date, file_path, outcomes)
+    return len(paths)
+
+
+def main(argv=None):
+    """
+    Command line entry point, for example:
+    python traffic_batch.py --from 01/06/2024 --to 30/06/2024 --workers 4
+    """
+    parser = argparse.ArgumentParser(
+        description="Process many traffic data files without prompting."
+    )
+    parser.add_argument("dates", nargs="*", type=parse_date, help="DD/MM/YYYY")
+    parser.add_argument("--from", dest="start", type=parse_date)
+    parser.add_argument("--to", dest="end", type=parse_date)
+    parser.add_argument(
+        "--glob",
+        dest="patterns",
+        action="append",
+        default=[],
+        help="e.g. 'traffic_data*062024.csv'",
+    )
+    parser.add_argument("--directory", default="./")
+    parser.add_argument("--results", default="results.txt")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+    if args.end is not None and args.start is None:
+        parser.error("--to needs --from")
+    files = collect_files(
+        args.dates, args.start, args.end, args.patterns, args.directory
+    )
+    if not files:
+        parser.error("no traffic data files matched")
+    run_batch(files, args.results, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+# Author: B.G Ranuga Gamage
+# Date: 3/12/2024
+# Student ID: 20231264
+
+import argparse
+import datetime
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+import traffic_cache
+import w2120198_abc
+from traffic_generator import generate_day_file
+from traffic_outcome_cache import OutcomeCache
+
+DEFAULT_SCALES = (10_000, 100_000, 1_000_000)
+BENCHMARK_DATE = datetime.date(2000, 1, 1)
+SAVES_PER_SCALE = 100
+
+
+def _remove_cache(file_path):
+    sidecar = traffic_cache.cache_path(file_path)
+    if os.path.exists(sidecar):
+        os.remove(sidecar)
+
+
+def _multi_csv_load(file_path, cold=False):
+    """MultiCSVProcessor.load_csv_file, parsing the CSV when cold is True."""
+    # imported here: the other stages do not need graphics and tkinter
+    from w2120198_de import MultiCSVProcessor
+
+    if cold:
+        _remove_cache(file_path)
+    MultiCSVProcessor().load_csv_file(file_path)
+
+
+def _cold_process(file_path, cache_dir):
+    """process_csv_data with empty outcome and binary caches."""
+    w2120198_abc.OUTCOME_CACHE = OutcomeCache(cache_dir, 0)  # max 0 bytes: no hits
+    _remove_cache(file_path)
+    return w2120198_abc.process_csv_data(file_path)
+
+
+def _warm_process(file_path, cache_dir):
+    """process_csv_data when the binary cache of the file already exists."""
+    w2120198_abc.OUTCOME_CACHE = OutcomeCache(cache_dir, 0)
+    return w2120198_abc.process_csv_data(file_path)
+
+
+def _save_results(lines, results_path):
+    for _ in range(SAVES_PER_SCALE):
+        w2120198_abc.save_results_to_file(lines, results_path)
+
+
+def measure(stage, rows, with_memory=True) -> dict:
+    """Times stage() once and, optionally, runs it again under tracemalloc."""
+    start = time.perf_counter()
+    stage()
+    seconds = time.perf_counter() - start
+    result = {
+        "seconds": seconds,
+        "rows_per_second": rows / seconds if seconds else float("inf"),
+    }
+    if with_memory:
+        tracemalloc.start()
+        stage()
+        result["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result
+
+
+def run_benchmarks(scales=DEFAULT_SCALES, directory=None, with_memory=True) -> list:
+    """
+    Generates a synthetic day per scale (reusing files that already exist) and
+    measures the main stages of the pipeline on it.
+    """
+    directory = directory or os.path.join(tempfile.gettempdir(), "traffic_benchmark")
+    results = []
+    saved_cache = w2120198_abc.OUTCOME_CACHE
+    try:
+        for rows in scales:
+            scale_dir = os.path.join(directory, str(rows))
+            os.makedirs(scale_dir, exist_ok=True)
+            file_path = os.path.join(scale_dir, "traffic_data01012000.csv")
+            if not os.path.exists(file_path):
+                generate_day_file(BENCHMARK_DATE, rows, scale_dir)
+            cache_dir = os.path.join(scale_dir, "outcomes")
+            results_path = os.path.join(scale_dir, "results.txt")
+            lines = w2120198_abc.format_outcomes(
+                w2120198_abc.calculate_outcomes(file_path)
+            )
+            stages = {
+                "load_csv_file": lambda: w2120198_abc.load_csv_file(file_path),
+                "process_csv_data (cold)": lambda: _cold_process(file_path, cache_dir),
+                "process_csv_data (cached)": lambda: _warm_process(
+                    file_path, cache_dir
+                ),
+                # the cached stages reuse the binary cache written by the cold one
+                "MultiCSVProcessor.load_csv_file (cached)": lambda: _multi_csv_load(
+                    file_path
+                ),
+                "MultiCSVProcessor.load_csv_file (cold)": lambda: _multi_csv_load(
+                    file_path, cold=True
+                ),
+                f"save_results_to_file x{SAVES_PER_SCALE}": lambda: _save_results(
+                    lines, results_path
+                ),
+            }
+            for name, stage in stages.items():
+                try:
+                    result = measure(stage, rows, with_memory)
+                except Exception as error:  # e.g. no display for w2120198_de
+                    result = {"error": f"{type(error).__name__}: {error}"}
+                results.append({"rows": rows, "stage": name, **result})
+            if os.path.exists(results_path):
+                os.remove(results_path)
+    finally:
+        w2120198_abc.OUTCOME_CACHE = saved_cache
+    return results
+
+
+def format_table(results: list) -> str:
+    lines = [f"{'rows':>12}  {'stage':<42}{'seconds':>10}{'rows/s':>14}{'peak MB':>10}"]
+    for result in results:
+        if "error" in result:
+            lines.append(
+                f"{result['rows']:>12,}  {result['stage']:<42}  {result['error']}"
+            )
+            continue
+        peak = result.get("peak_bytes")
+        lines.append(
+            f"{result['rows']:>12,}  {result['stage']:<42}"
+            f"{result['seconds']:>10.3f}{result['rows_per_second']:>14,.0f}"
+            f"{peak / 1e6 if peak is not None else float('nan'):>10.1f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """
+    Command line entry point, for example:
+    python traffic_benchmark.py --scales 10000 100000 1000000 --json bench.json
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the traffic pipeline.")
+    parser.add_argument("--scales", type=int, nargs="+", default=list(DEFAULT_SCALES))
+    parser.add_argument("--directory", help="where the synthetic files are kept")
+    parser.add_argument("--no-memory", action="store_true", help="skip tracemalloc")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args(argv)
+    results = run_benchmarks(args.scales, args.directory, not args.no_memory)
+    print(format_table(results))
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
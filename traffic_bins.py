@@ -0,0 +1,162 @@
+# Author: B.G Ranuga Gamage
+# Date: 3/12/2024
+# Student ID: 20231264
+
+from array import array
+from itertools import accumulate
+
+from traffic_index import get_index
+from traffic_vector import as_array, get_numpy
+
+BIN_MINUTES = (1, 5, 15, 60)
+SECONDS_PER_DAY = 24 * 3600
+
+
+def parse_time(value) -> int:
+    """
+    Returns seconds since midnight for "HH:MM", "HH:MM:SS" or a number of
+    seconds. "24:00" is accepted as the end of the day.
+    """
+    if isinstance(value, int):
+        seconds = value
+    else:
+        parts = value.strip().split(":")
+        if not 2 <= len(parts) <= 3 or not all(part.isdigit() for part in parts):
+            raise ValueError(f"invalid time {value!r}, expected HH:MM or HH:MM:SS")
+        hours, minutes, seconds = (list(map(int, parts)) + [0])[:3]
+        if minutes > 59 or seconds > 59:
+            raise ValueError(f"invalid time {value!r}")
+        seconds += hours * 3600 + minutes * 60
+    if not 0 <= seconds <= SECONDS_PER_DAY:
+        raise ValueError(f"time {value!r} is outside the day")
+    return seconds
+
+
+class TimeBins:
+    def __init__(self, bin_minutes: int, counts: dict):
+        """
+        Vehicle counts per junction in fixed bins of bin_minutes, with prefix
+        sums so the count of any window made of whole bins takes O(1).
+        counts maps junction -> list with one count per bin of the day.
+        """
+        if bin_minutes not in BIN_MINUTES:
+            raise ValueError(f"bin size must be one of {BIN_MINUTES} minutes")
+        self.bin_minutes = bin_minutes
+        self.bin_seconds = bin_minutes * 60
+        self.bin_count = SECONDS_PER_DAY // self.bin_seconds
+        self.counts = counts
+        # prefix[junction][i] = vehicles in the bins before bin i
+        self.prefix = {
+            junction: array("q", accumulate(values, initial=0))
+            for junction, values in counts.items()
+        }
+        totals = [0] * self.bin_count
+        for values in counts.values():
+            totals = [total + count for total, count in zip(totals, values)]
+        self.prefix[None] = array("q", accumulate(totals, initial=0))  # all junctions
+
+    @classmethod
+    def from_dataset(cls, dataset, bin_minutes: int = 5) -> "TimeBins":
+        """Bins a TrafficDataset in one pass over its time and junction columns."""
+        if bin_minutes not in BIN_MINUTES:
+            raise ValueError(f"bin size must be one of {BIN_MINUTES} minutes")
+        bin_seconds = bin_minutes * 60
+        bin_count = SECONDS_PER_DAY // bin_seconds
+        junction = dataset["JunctionName"]
+        seconds = dataset["timeOfDay"].seconds
+        np = get_numpy()
+        if np is not None:  # one bincount over (junction, bin) pairs
+            keys = as_array(junction.codes).astype(np.int64) * bin_count
+            keys += as_array(seconds) // bin_seconds
+            flat = np.bincount(keys, minlength=len(junction.values) * bin_count)
+            rows = flat.reshape(len(junction.values), bin_count).tolist()
+        else:
+            rows = [[0] * bin_count for _ in junction.values]
+            for code, second in zip(junction.codes, seconds):
+                rows[code][second // bin_seconds] += 1
+        return cls(bin_minutes, dict(zip(junction.values, rows)))
+
+    def _bin(self, seconds: int) -> int:
+        if seconds % self.bin_seconds:
+            raise ValueError(
+                f"{seconds // 3600:02d}:{seconds // 60 % 60:02d} is not on a "
+                f"{self.bin_minutes} minute boundary, use smaller bins"
+            )
+        return seconds // self.bin_seconds
+
+    def count(self, start, end, junction: str = None) -> int:
+        """
+        Number of vehicles from start (inclusive) to end (exclusive) at the
+        junction, or at every junction when junction is None, e.g.
+        bins.count("08:10", "09:35", "Hanley Highway/Westway").
+        """
+        prefix = self.prefix.get(junction)
+        if prefix is None:
+            return 0  # junction not in this day
+        first, last = self._bin(parse_time(start)), self._bin(parse_time(end))
+        if last < first:
+            raise ValueError("the window ends before it starts")
+        return prefix[last] - prefix[first]
+
+    def series(self, junction: str = None) -> list:
+        """Returns [("HH:MM", count)] for every bin of the day."""
+        prefix = self.prefix.get(junction)
+        series = []
+        for idx in range(self.bin_count):
+            minutes = idx * self.bin_minutes
+            count = prefix[idx + 1] - prefix[idx] if prefix is not None else 0
+            series.append((f"{minutes // 60:02d}:{minutes % 60:02d}", count))
+        return series
+
+
+def get_time_bins(dataset, bin_minutes: int = 5) -> TimeBins:
+    """Returns the TimeBins of the dataset, building them once per bin size."""
+    bins = get_index(dataset).time_bins
+    if bin_minutes not in bins:
+        bins[bin_minutes] = TimeBins.from_dataset(dataset, bin_minutes)
+    return bins[bin_minutes]
+
+
+def match_junction(dataset, name: str) -> str:
+    """Returns the junction whose name contains name (case insensitive)."""
+    matches = [
+        junction
+        for junction in dataset["JunctionName"].values
+        if name.lower() in junction.lower()
+    ]
+    if len(matches) != 1:
+        raise ValueError(f"{name!r} matches {len(matches)} junctions: {matches}")
+    return matches[0]
+
+
+def main(argv=None):
+    """
+    Command line entry point, for example:
+    python traffic_bins.py traffic_data15062024.csv --from 08:10 --to 09:35 --junction hanley
+    """
+    import argparse
+
+    from traffic_cache import load_cached_dataset
+    from w2120198_abc import load_csv_file
+
+    parser = argparse.ArgumentParser(description="Vehicles in a time window.")
+    parser.add_argument("file_path")
+    parser.add_argument("--from", dest="start", required=True, help="HH:MM")
+    parser.add_argument("--to", dest="end", required=True, help="HH:MM")
+    parser.add_argument("--junction", help="part of the junction name")
+    parser.add_argument("--bin", type=int, choices=BIN_MINUTES, default=1)
+    args = parser.parse_args(argv)
+    dataset = load_cached_dataset(
+        args.file_path, load_csv_file, ("JunctionName", "timeOfDay")
+    )
+    try:
+        junction = args.junction and match_junction(dataset, args.junction)
+        count = get_time_bins(dataset, args.bin).count(args.start, args.end, junction)
+    except ValueError as error:
+        parser.error(str(error))
+    where = junction or "all junctions"
+    print(f"{count} vehicles between {args.start} and {args.end} at {where}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+# Author: B.G Ranuga Gamage
+# Date: 3/12/2024
+# Student ID: 20231264
+
+import json
+import mmap
+import os
+import struct
+import sys
+
+from traffic_dataset import (
+    BitColumn,
+    CategoryColumn,
+    IntColumn,
+    TextColumn,
+    TimeColumn,
+    TrafficDataset,
+)
+from traffic_trace import traced
+
+CACHE_DIR = ".traffic_cache"  # next to the CSV files, one per data directory
+CACHE_MAGIC = b"TDC1"
+CACHE_VERSION = 1
+ALIGNMENT = 8
+
+
+def cache_path(file_path: str) -> str:
+    """
+    Returns the cache path for a CSV file (.traffic_cache/traffic_dataDDMMYYYY.csv.cache).
+    Caches live in a sub-directory so writing them does not change the mtime
+    of the data directory, which the catalog uses to notice new files.
+    """
+    directory, name = os.path.split(file_path)
+    return os.path.join(directory, CACHE_DIR, f"{name}.cache")
+
+
+def file_hash(file_path: str) -> str:
+    """Returns the SHA-1 of the file contents, read in 1 MB blocks."""
+    import hashlib  # only needed when a cache or outcome entry is checked by hash
+
+    digest = hashlib.sha1()
+    with open(file_path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _column_buffer(column):
+    """Returns (kind, raw bytes, extra header fields) for a column."""
+    if isinstance(column, CategoryColumn):
+        return "category", column.codes, {"values": list(column.values)}
+    if isinstance(column, IntColumn):
+        return "int", column.data, {}
+    if isinstance(column, BitColumn):
+        extra = {"length": column.length, "true_value": column.true_value}
+        return "bit", column.bits, extra
+    if isinstance(column, TimeColumn):
+        return "time", column.seconds, {}
+    return "text", "\n".join(column.data).encode(), {"length": len(column)}
+
+
+def _typecode(buffer) -> str:
+    return getattr(buffer, "typecode", None) or getattr(buffer, "format", "B")
+
+
+@traced()
+def write_cache(dataset: TrafficDataset, file_path: str, digest: str = None) -> str:
+    """
+    Writes the columns of the dataset to the sidecar cache of file_path.
+    The header records the size, mtime and hash of the CSV so stale caches
+    can be detected, followed by every column as raw aligned bytes.
+    """
+    stat = os.stat(file_path)
+    columns, blobs, offset = [], [], 0
+    for name, column in dataset.columns.items():
+        kind, buffer, extra = _column_buffer(column)
+        raw = memoryview(buffer).cast("B")  # raw bytes of the array
+        columns.append(
+            {
+                "name": name,
+                "kind": kind,
+                "typecode": _typecode(buffer),
+                "offset": offset,
+                "nbytes": raw.nbytes,
+                **extra,
+            }
+        )
+        blobs.append(raw)
+        offset += -(-raw.nbytes // ALIGNMENT) * ALIGNMENT  # keep columns aligned
+    header = json.dumps(
+        {
+            "version": CACHE_VERSION,
+            "byteorder": sys.byteorder,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha1": digest or file_hash(file_path),
+            "rows": dataset.row_count(),
+            "columns": columns,
+        }
+    ).encode()
+    prefix = len(CACHE_MAGIC) + 4 + len(header)
+    padding = -prefix % ALIGNMENT
+    path = cache_path(file_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as file:
+        file.write(CACHE_MAGIC)
+        file.write(struct.pack("<I", len(header) + padding))
+        file.write(header + b" " * padding)
+        for raw in blobs:
+            file.write(raw)
+            file.write(b"\0" * (-raw.nbytes % ALIGNMENT))
+    os.replace(temp_path, path)  # never leave a half written cache behind
+    return path
+
+
+def _read_header(mapped):
+    if mapped[: len(CACHE_MAGIC)] != CACHE_MAGIC:
+        return None, 0
+    (header_length,) = struct.unpack_from("<I", mapped, len(CACHE_MAGIC))
+    start = len(CACHE_MAGIC) + 4
+    header = json.loads(bytes(mapped[start : start + header_length]))
+    return header, start + header_length
+
+
+def _restamp(path: str, header: dict, header_length: int, mtime_ns: int):
+    """
+    Records the new mtime of an unchanged CSV in the cache header, in place,
+    so the next load does not hash the file again.
+    """
+    header = json.dumps({**header, "mtime_ns": mtime_ns}).encode()
+    if len(header) > header_length:  # does not fit the padding, hash next time
+        return
+    try:
+        with open(path, "r+b") as file:
+            file.seek(len(CACHE_MAGIC) + 4)
+            file.write(header + b" " * (header_length - len(header)))
+    except OSError:  # read-only cache, the hash check still works
+        pass
+
+
+def _is_fresh(header: dict, file_path: str, digest: str = None) -> bool:
+    """
+    Checks size and mtime first. When only the mtime changed the hash decides,
+    using digest when the caller already hashed the file.
+    """
+    if header.get("version") != CACHE_VERSION or header["byteorder"] != sys.byteorder:
+        return False
+    stat = os.stat(file_path)
+    if stat.st_size != header["size"]:
+        return False
+    if stat.st_mtime_ns == header["mtime_ns"]:
+        return True
+    if (digest or file_hash(file_path)) != header["sha1"]:
+        return False
+    header["mtime_ns"] = stat.st_mtime_ns  # touched but unchanged
+    return True
+
+
+def cached_row_count(file_path: str):
+    """Returns the row count recorded in a fresh cache of the file, or None."""
+    try:
+        with open(cache_path(file_path), "rb") as file:
+            prefix = file.read(len(CACHE_MAGIC) + 4)
+            (header_length,) = struct.unpack_from("<I", prefix, len(CACHE_MAGIC))
+            header, _ = _read_header(prefix + file.read(header_length))
+    except (OSError, ValueError, struct.error):
+        return None
+    if header is None or not _is_fresh(header, file_path):
+        return None
+    return header.get("rows")
+
+
+def _build_column(spec: dict, view: memoryview):
+    kind = spec["kind"]
+    if kind == "text":
+        column = TextColumn()
+        column.data = bytes(view).decode().split("\n") if spec["length"] else []
+    elif kind == "category":
+        column = CategoryColumn()
+        column.values = spec["values"]
+        column.lookup = {value: code for code, value in enumerate(column.values)}
+        column.codes = view.cast(spec["typecode"])
+    elif kind == "int":
+        column = IntColumn()
+        column.data = view.cast(spec["typecode"])
+    elif kind == "bit":
+        column = BitColumn(spec["true_value"])
+        column.bits = view
+        column.length = spec["length"]
+    else:
+        column = TimeColumn()
+        column.seconds = view.cast(spec["typecode"])
+    return column
+
+
+@traced()
+def read_cache(file_path: str, digest: str = None):
+    """
+    Opens the sidecar cache with mmap and returns a read-only TrafficDataset whose
+    columns are zero-copy views over the mapped file, or None if the cache is
+    missing or stale. digest is the SHA-1 of the CSV when the caller knows it.
+    """
+    path = cache_path(file_path)
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return None
+    with open(path, "rb") as file:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        header, data_start = _read_header(mapped)
+    except (ValueError, struct.error):  # corrupt header
+        header = None
+    if header is None:
+        mapped.close()
+        return None
+    mtime_ns = header["mtime_ns"]
+    if not _is_fresh(header, file_path, digest):
+        mapped.close()
+        return None
+    if header["mtime_ns"] != mtime_ns:
+        _restamp(path, header, data_start - len(CACHE_MAGIC) - 4, header["mtime_ns"])
+    view = memoryview(mapped)
+    columns = {}
+    for spec in header["columns"]:
+        start = data_start + spec["offset"]
+        columns[spec["name"]] = _build_column(
+            spec, view[start : start + spec["nbytes"]]
+        )
+    dataset = TrafficDataset.from_columns(columns)
+    dataset.mapped = mapped  # keep the mapping alive as long as the dataset
+    return dataset
+
+
+def load_cached_dataset(
+    file_path: str, loader, columns=None, digest: str = None
+) -> TrafficDataset:
+    """
+    Returns the dataset for file_path from its binary cache, parsing the CSV
+    with loader (and refreshing the cache) only when the cache is stale.
+    With columns, only those columns are returned, and on a cache miss only
+    they are parsed with loader(file_path, columns); the partial result is
+    not cached. digest, the SHA-1 of the CSV when the caller already has it,
+    saves hashing the file again.
+    """
+    dataset = read_cache(file_path, digest)
+    if dataset is not None:
+        return dataset if columns is None else dataset.project(columns)
+    if columns is not None:
+        return loader(file_path, columns)
+    dataset = loader(file_path)
+    try:
+        write_cache(dataset, file_path, digest)
+    except OSError:  # read-only data directory, carry on without a cache
+        pass
+    return dataset
@@ -0,0 +1,243 @@
+# Author: B.G Ranuga Gamage
+# Date: 3/12/2024
+# Student ID: 20231264
+
+import bisect
+import datetime
+import json
+import os
+import re
+
+CATALOG_FILE = ".catalog.json"
+DATA_DIRS_VARIABLE = "TRAFFIC_DATA_DIRS"
+FILE_NAME_PATTERN = re.compile(r"^traffic_data(\d{2})(\d{2})(\d{4})\.csv$")
+
+
+def data_directories() -> list:
+    """
+    Returns the configured data directories: the TRAFFIC_DATA_DIRS environment
+    variable (separated like PATH) or the current directory.
+    """
+    value = os.environ.get(DATA_DIRS_VARIABLE, "")
+    return [directory for directory in value.split(os.pathsep) if directory] or ["./"]
+
+
+def count_rows(file_path: str) -> int:
+    """Counts the data rows (lines after the header) of a CSV file."""
+    lines, last = 0, b"\n"
+    with open(file_path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            lines += block.count(b"\n")
+            last = block[-1:]
+    if last != b"\n":
+        lines += 1  # last line without a newline
+    return max(lines - 1, 0)
+
+
+def date_of_name(name: str):
+    """Returns the date of a traffic_dataDDMMYYYY.csv file name, or None."""
+    match = FILE_NAME_PATTERN.match(name)
+    if match is None:
+        return None
+    day, month, year = map(int, match.groups())
+    try:
+        return datetime.date(year, month, day)
+    except ValueError:
+        return None
+
+
+class DirectoryManifest:
+    def __init__(self, directory: str):
+        """
+        The catalog of one data directory, kept in <directory>/.catalog.json.
+        The directory is only listed again when its mtime changes, and only
+        new or modified files are re-examined. Row counts are filled in on
+        first request, never by a refresh.
+        """
+        self.directory = directory
+        self.path = os.path.join(directory, CATALOG_FILE)
+        self.directory_mtime = None
+        self.entries = {}  # file name -> {"date", "size", "mtime_ns", "rows"}
+        # "rows" is None until row_count is asked for it
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                stored = json.load(file)
+            self.directory_mtime = stored["directory_mtime_ns"]
+            self.entries = stored["entries"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+    def refresh(self, full=False) -> bool:
+        """
+        Brings the manifest up to date, returns True when anything changed.
+        Files rewritten in place do not change the directory mtime, full=True
+        re-checks every file anyway.
+        """
+        try:
+            directory_mtime = os.stat(self.directory).st_mtime_ns
+        except OSError:
+            changed = bool(self.entries)
+            self.entries = {}
+            return changed
+        if directory_mtime == self.directory_mtime and not full:
+            return False  # no file was added, removed or renamed
+        entries = {}
+        for item in os.scandir(self.directory):
+            date = date_of_name(item.name)
+            if date is None or not item.is_file():
+                continue
+            entries[item.name] = self._entry(item.name, date, item.stat())
+        self.entries = entries
+        self.directory_mtime = directory_mtime  # as seen before the scan
+        self.save()
+        return True
+
+    def _entry(self, name: str, date: datetime.date, stat) -> dict:
+        """The known entry of a file while its size and mtime match, else a new one."""
+        known = self.entries.get(name)
+        if known and [known["size"], known["mtime_ns"]] == [
+            stat.st_size,
+            stat.st_mtime_ns,
+        ]:
+            return known  # unchanged, keep the row count
+        return {
+            "date": date.isoformat(),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "rows": None,  # counted on first request
+        }
+
+    def revalidate(self, name: str):
+        """
+        Re-checks one file against its entry, since appending to a file in place
+        does not change the directory mtime. Returns the current entry, or None
+        when the file is gone.
+        """
+        try:
+            stat = os.stat(os.path.join(self.directory, name))
+        except OSError:
+            stat = None
+        known = self.entries.get(name)
+        if stat is None or known is None:
+            if self.entries.pop(name, None) is not None:
+                self.save()
+            return None
+        entry = self._entry(name, datetime.date.fromisoformat(known["date"]), stat)
+        if entry is not known:
+            self.entries[name] = entry
+            self.save()
+        return entry
+
+    def save(self):
+        """
+        Writes the manifest. The directory mtime stays the one read before the
+        last scan, so changes made since then are still seen by the next refresh.
+        """
+        try:
+            with open(self.path, "w", encoding="utf-8") as file:
+                json.dump(
+                    {
+                        "directory_mtime_ns": self.directory_mtime,
+                        "entries": self.entries,
+                    },
+                    file,
+                )
+        except OSError:
+            pass
+
+    def row_count(self, name: str) -> int:
+        """
+        Returns the data rows of a file, taken from its dataset cache when the
+        day was already loaded and counted from the file otherwise, once per
+        version of the file.
+        """
+        entry = self.revalidate(name)
+        if entry is None:
+            raise KeyError(name)
+        if entry.get("rows") is None:
+            from traffic_cache import cached_row_count
+
+            path = os.path.join(self.directory, name)
+            rows = cached_row_count(path)
+            entry["rows"] = count_rows(path) if rows is None else rows
+            self.save()
+        return entry["rows"]
+
+
+class DatasetCatalog:
+    def __init__(self, directories=None):
+        """
+        Catalog of the survey days available in the data directories, with
+        O(log n) lookups by date and by date range.
+        """
+        self.manifests = [
+            DirectoryManifest(directory)
+            for directory in directories or data_directories()
+        ]
+        self.dates = []  # sorted survey dates
+        self.files = {}  # date -> catalog entry with its "path"
+        self.owners = {}  # date -> manifest of the directory holding the file
+        self.refreshed = False  # the directories are only read on first use
+
+    def refresh(self, full=False):
+        """Refreshes every directory manifest and rebuilds the date index if needed."""
+        changed = [manifest.refresh(full) for manifest in self.manifests]
+        if any(changed) or not self.refreshed:
+            self.refreshed = True
+            self.files = {}
+            self.owners = {}
+            for manifest in reversed(self.manifests):  # earlier directories win
+                for name, entry in manifest.entries.items():
+                    date = datetime.date.fromisoformat(entry["date"])
+                    path = os.path.join(manifest.directory, name)
+                    self.files[date] = {**entry, "path": path}
+                    self.owners[date] = manifest
+            self.dates = sorted(self.files)
+        return self
+
+    def row_count(self, date: datetime.date):
+        """Returns the number of data rows of a day, or None when it is not cataloged."""
+        entry = self.get(date)
+        if entry is None:
+            return None
+        if entry["rows"] is None:
+            name = os.path.basename(entry["path"])
+            entry["rows"] = self.owners[date].row_count(name)
+        return entry["rows"]
+
+    def get(self, date: datetime.date):
+        """
+        Returns the catalog entry of a date (path, size, ...) or None. The file
+        itself is stat'ed, so a day rewritten or appended to in place gets a
+        fresh entry. Its "rows" may be None, row_count fills it in.
+        """
+        if not self.refreshed:
+            self.refresh()
+        position = bisect.bisect_left(self.dates, date)
+        if position == len(self.dates) or self.dates[position] != date:
+            return None
+        path = self.files[date]["path"]
+        entry = self.owners[date].revalidate(os.path.basename(path))
+        if entry is None:  # removed since the last refresh, rebuild the index
+            self.refreshed = False
+            return self.get(date)
+        if [entry["size"], entry["mtime_ns"]] != [
+            self.files[date]["size"],
+            self.files[date]["mtime_ns"],
+        ]:
+            self.files[date] = {**entry, "path": path}
+        return self.files[date]
+
+    def path_of(self, file_name: str):
+        """Returns the path of a traffic_dataDDMMYYYY.csv file name, or None."""
+        date = date_of_name(os.path.basename(file_name))
+        entry = self.get(date) if date else None
+        return entry["path"] if entry else None
+
+    def between(self, start: datetime.date, end: datetime.date) -> list:
+        """Returns the sorted (date, entry) pairs from start to end, both included."""
+        if not self.refreshed:
+            self.refresh()
+        low = bisect.bisect_left(self.dates, start)
+        high = bisect.bisect_right(self.dates, end)
+        return [(date, self.files[date]) for date in self.dates[low:high]]
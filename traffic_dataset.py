@@ -0,0 +1,305 @@
+# Author: B.G Ranuga Gamage
+# Date: 3/12/2024
+# Student ID: 20231264
+
+from array import array
+
+_FLAG_DIGITS = bytes.maketrans(b"\x00\x01", b"01")  # flag byte -> binary digit
+
+
+class CategoryColumn:
+    def __init__(self):
+        """
+        Dictionary-encoded column: every distinct string is stored once and
+        each row only keeps a small integer code.
+        """
+        self.codes = array("B")  # one byte per row until there are 256 values
+        self.values = []  # code -> string
+        self.lookup = {}  # string -> code
+
+    def encode(self, value: str) -> int:
+        """Returns the code of the value, adding it to the dictionary if it is new."""
+        code = self.lookup.get(value)
+        if code is None:
+            code = len(self.values)
+            if code == 256 and self.codes.typecode == "B":
+                self.codes = array("H", self.codes)  # widen the codes
+            self.lookup[value] = code
+            self.values.append(value)
+        return code
+
+    def append(self, value: str):
+        self.codes.append(self.encode(value))
+
+    def extend(self, other: "CategoryColumn"):
+        """Appends the rows of another category column, re-mapping its codes."""
+        mapping = [self.encode(value) for value in other.values]
+        if self.codes.typecode == "B" and other.codes.typecode == "B":
+            table = bytes(mapping) + bytes(256 - len(mapping))  # re-map in C
+            self.codes.frombytes(bytes(other.codes).translate(table))
+        else:
+            self.codes.extend(map(mapping.__getitem__, other.codes))
+
+    def extend_bytes(self, fields):
+        """Appends raw bytes fields, decoding each distinct value only once."""
+        lookup = {value.encode(): code for value, code in self.lookup.items()}
+        try:
+            codes = array(self.codes.typecode, map(lookup.__getitem__, fields))
+        except KeyError:  # new values in these rows
+            for field in set(fields).difference(lookup):
+                lookup[field] = self.encode(field.decode())
+            codes = map(lookup.__getitem__, fields)
+        self.codes.extend(codes)
+
+    def code_of(self, value: str):
+        """Returns the code of the value or None when it never appears."""
+        return self.lookup.get(value)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, idx):
+        return self.values[self.codes[idx]]
+
+    def __iter__(self):
+        return map(self.values.__getitem__, self.codes)
+
+
+class IntColumn:
+    def __init__(self, typecode="H"):
+        """
+        Integer column backed by an array, so values are parsed once at load time.
+        """
+        self.data = array(typecode)
+
+    def append(self, value: str):
+        self.data.append(int(value))
+
+    def extend(self, other: "IntColumn"):
+        self.data.extend(other.data)
+
+    def extend_bytes(self, fields):
+        self.data.extend(map(int, fields))  # int() parses bytes directly
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, idx):
+        return self.data[idx]
+
+    def __iter__(self):
+        return iter(self.data)
+
+
+class BitColumn:
+    def __init__(self, true_value="True"):
+        """
+        Boolean column packed eight rows per byte.
+        """
+        self.bits = bytearray()
+        self.length = 0
+        self.true_value = true_value
+
+    def append_flag(self, flag: bool):
+        if self.length & 7 == 0:  # start a new byte every eight rows
+            self.bits.append(0)
+        if flag:
+            self.bits[-1] |= 1 << (self.length & 7)
+        self.length += 1
+
+    def append(self, value: str):
+        self.append_flag(value == self.true_value)
+
+    def extend(self, other: "BitColumn"):
+        if self.length & 7 == 0:  # byte aligned, copy the packed bytes
+            self.bits.extend(other.bits)
+            self.length += other.length
+        elif other.length:  # shift the other bits into place as one integer
+            shift = self.length & 7
+            value = int.from_bytes(other.bits, "little") & ((1 << other.length) - 1)
+            value = self.bits[-1] | value << shift
+            self.bits[-1:] = value.to_bytes((shift + other.length + 7) >> 3, "little")
+            self.length += other.length
+
+    def extend_bytes(self, fields):
+        """
+        Appends raw bytes fields. The flags are written as a string of "0" and
+        "1" digits, last row first, and int(..., 2) packs them into bits.
+        """
+        flags = bytes(map(self.true_value.encode().__eq__, fields))
+        start = -self.length & 7  # rows left to fill in the last byte
+        for flag in flags[:start]:
+            self.append_flag(flag)
+        flags = flags[start:]
+        if flags:
+            digits = flags[::-1].translate(_FLAG_DIGITS)
+            self.bits.extend(int(digits, 2).to_bytes((len(flags) + 7) >> 3, "little"))
+            self.length += len(flags)
+
+    def count(self) -> int:
+        """Returns the number of True rows."""
+        return sum(bin(byte).count("1") for byte in self.bits)
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, idx):
+        if idx < 0:
+            idx += self.length
+        if not 0 <= idx < self.length:
+            raise IndexError("bit column index out of range")
+        return bool(self.bits[idx >> 3] >> (idx & 7) & 1)
+
+    def __iter__(self):
+        bits = self.bits
+        return (bool(bits[idx >> 3] >> (idx & 7) & 1) for idx in range(self.length))
+
+
+class TimeColumn:
+    def __init__(self):
+        """
+        Time of day column stored as seconds since midnight.
+        """
+        self.seconds = array("i")
+
+    def append(self, value: str):
+        hours, minutes, seconds = value.split(":")
+        self.seconds.append(int(hours) * 3600 + int(minutes) * 60 + int(seconds))
+
+    def extend(self, other: "TimeColumn"):
+        self.seconds.extend(other.seconds)
+
+    def extend_bytes(self, fields):
+        """Appends raw b"HH:MM:SS" fields, parsing each distinct time only once."""
+        parsed = {}
+        for field in set(fields):
+            hours, minutes, seconds = field.split(b":")
+            parsed[field] = int(hours) * 3600 + int(minutes) * 60 + int(seconds)
+        self.seconds.extend(map(parsed.__getitem__, fields))
+
+    def hour(self, idx) -> int:
+        return self.seconds[idx] // 3600
+
+    def hours(self):
+        """Returns an iterator over the hour (0-23) of every row."""
+        return (seconds // 3600 for seconds in self.seconds)
+
+    def __len__(self):
+        return len(self.seconds)
+
+    def __getitem__(self, idx):
+        return format_time(self.seconds[idx])
+
+    def __iter__(self):
+        return map(format_time, self.seconds)
+
+
+class TextColumn:
+    def __init__(self):
+        """
+        Plain list of strings, used for columns that are not in the schema.
+        """
+        self.data = []
+
+    def append(self, value: str):
+        self.data.append(value)
+
+    def extend(self, other: "TextColumn"):
+        self.data.extend(other.data)
+
+    def extend_bytes(self, fields):
+        self.data.extend(field.decode() for field in fields)
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, idx):
+        return self.data[idx]
+
+    def __iter__(self):
+        return iter(self.data)
+
+
+SCHEMA = {
+    "JunctionName": CategoryColumn,
+    "Date": CategoryColumn,
+    "timeOfDay": TimeColumn,
+    "travel_Direction_in": CategoryColumn,
+    "travel_Direction_out": CategoryColumn,
+    "Weather_Conditions": CategoryColumn,
+    "JunctionSpeedLimit": IntColumn,
+    "VehicleSpeed": IntColumn,
+    "VehicleType": CategoryColumn,
+    "elctricHybrid": BitColumn,
+}
+
+
+def format_time(seconds: int) -> str:
+    return f"{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+class TrafficDataset:
+    def __init__(self, column_names):
+        """
+        Typed columnar store for one day of traffic data. It can be used like the
+        old dictionary of lists: dataset[column][idx] returns the decoded value.
+        """
+        self.columns = {
+            name: SCHEMA.get(name, TextColumn)() for name in column_names
+        }  # pick the encoding of every column from the schema
+        self._appenders = [column.append for column in self.columns.values()]
+        self.index = None  # bitmap indexes, built on first filter (traffic_index)
+
+    @classmethod
+    def from_columns(cls, columns: dict) -> "TrafficDataset":
+        """Builds a dataset around columns that already hold their data."""
+        dataset = cls([])
+        dataset.columns = dict(columns)
+        dataset._appenders = [column.append for column in dataset.columns.values()]
+        return dataset
+
+    def project(self, column_names) -> "TrafficDataset":
+        """Returns a dataset sharing only the given columns with this one."""
+        return TrafficDataset.from_columns(
+            {name: self.columns[name] for name in self.columns if name in column_names}
+        )
+
+    def append_row(self, values):
+        """Appends one row given as the list of raw string fields."""
+        self.index = None  # the rows changed, drop any index
+        for append, value in zip(self._appenders, values):
+            append(value)
+
+    def extend_bytes(self, fields):
+        """Appends rows given as one sequence of raw bytes fields per column."""
+        self.index = None
+        for column, values in zip(self.columns.values(), fields):
+            column.extend_bytes(values)
+
+    def extend(self, other: "TrafficDataset"):
+        """Appends the rows of another dataset with the same columns."""
+        self.index = None
+        for name, column in self.columns.items():
+            column.extend(other.columns[name])
+
+    def keys(self):
+        return self.columns.keys()
+
+    def to_dict(self) -> dict:
+        """Returns the data as the old dictionary of lists of strings."""
+        return {
+            name: [str(value) for value in column]
+            for name, column in self.columns.items()
+        }
+
+    def __getitem__(self, column):
+        return self.columns[column]
+
+    def __contains__(self, column):
+        return column in self.columns
+
+    def __iter__(self):
+        return iter(self.columns)
+
+    def row_count(self) -> int:
+        return len(next(iter(self.columns.values()))) if self.columns else 0
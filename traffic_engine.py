@@ -0,0 +1,230 @@
+# Author: B.G Ranuga Gamage
+# Date: 3/12/2024
+# Student ID: 20231264
+
+METRICS_VERSION = 2  # bump whenever an outcome is added or computed differently
+TWO_WHEELED_TYPES = ("Bicycle", "Motorcycle", "Scooter")
+RAIN_CONDITIONS = ("Heavy Rain", "Light Rain")
+ELM_AVENUE = "Elm Avenue/Rabbit Road"
+HANLEY_HIGHWAY = "Hanley Highway/Westway"
+
+
+def calculate_percentage(numerator, denominator, dtype=round):
+    """Calculates the percentage, rounded to an integer."""
+    return dtype(numerator / denominator * 100)  # return the rounded up or down value
+
+
+def find_peak_traffic_hour(hour_count: dict):
+    """
+    Finds the peak traffic hour(s). Tied hours next to each other form one span,
+    tied hours that are apart are listed as separate spans.
+    """
+    max_count = max(
+        hour_count.values()
+    )  # get the maximum count of the values in the hour_count dict
+    peak_hours = sorted(
+        hour for hour, count in hour_count.items() if count == max_count
+    )  # finding the peak hours in clock order
+    spans = []  # [first hour, hour after the last] of every run of peak hours
+    for hour in peak_hours:
+        if spans and spans[-1][1] == hour:
+            spans[-1][1] = hour + 1  # extend the current run
+        else:
+            spans.append([hour, hour + 1])
+    return ", ".join(f"Between {start}:00 and {end}:00" for start, end in spans)
+
+
+class OutcomeAccumulator:
+    def __init__(self):
+        """
+        Initializes every counter needed for the outcomes so that a single pass
+        over the rows is enough to produce the full outcome dictionary.
+        """
+        self.total = 0
+        self.trucks = 0
+        self.electric = 0
+        self.two_wheeled = 0
+        self.bicycles = 0
+        self.buses_north_elm = 0
+        self.same_direction = 0
+        self.over_speed_limit = 0
+        self.elm_vehicles = 0
+        self.elm_scooters = 0
+        self.hanley_vehicles = 0
+        self.hour_count = {}  # insertion ordered, like get_hour_count
+        self.hanley_hour_count = {}
+        self.rain_hours = set()
+
+    def add(
+        self,
+        junction,
+        hour,
+        direction_in,
+        direction_out,
+        weather,
+        speed_limit,
+        speed,
+        vehicle_type,
+        electric,
+    ):
+        """
+        Adds a single already-typed row (hour, speeds as int and electric as bool)
+        to every counter.
+        """
+        self.total += 1
+        if vehicle_type == "Truck":
+            self.trucks += 1
+        elif vehicle_type == "Bicycle":
+            self.bicycles += 1
+        elif vehicle_type == "Car" and speed > speed_limit:
+            self.over_speed_limit += 1
+        if vehicle_type in TWO_WHEELED_TYPES:
+            self.two_wheeled += 1
+        if electric:
+            self.electric += 1
+        if direction_in == direction_out:
+            self.same_direction += 1
+        if junction == ELM_AVENUE:
+            self.elm_vehicles += 1
+            if vehicle_type == "Scooter":
+                self.elm_scooters += 1
+            elif vehicle_type == "Bus" and direction_out == "North":
+                self.buses_north_elm += 1
+        elif junction == HANLEY_HIGHWAY:
+            self.hanley_vehicles += 1
+            self.hanley_hour_count[hour] = self.hanley_hour_count.get(hour, 0) + 1
+        if weather in RAIN_CONDITIONS:
+            self.rain_hours.add(hour)
+        self.hour_count[hour] = self.hour_count.get(hour, 0) + 1
+
+    def add_rows(self, data: dict):
+        """
+        Adds every row of a dictionary of columns (as returned by load_csv_file)
+        in one pass over the rows.
+        """
+        add = self.add  # local lookup is faster inside the loop
+        for row in zip(
+            data["JunctionName"],
+            data["timeOfDay"],
+            data["travel_Direction_in"],
+            data["travel_Direction_out"],
+            data["Weather_Conditions"],
+            data["JunctionSpeedLimit"],
+            data["VehicleSpeed"],
+            data["VehicleType"],
+            data["elctricHybrid"],
+        ):
+            junction, time_of_day, dir_in, dir_out, weather = row[:5]
+            speed_limit, speed, vehicle_type, electric = row[5:]
+            add(
+                junction,
+                int(time_of_day[:2]),
+                dir_in,
+                dir_out,
+                weather,
+                int(speed_limit),
+                int(speed),
+                vehicle_type,
+                electric == "True",
+            )
+        return self
+
+    def add_dataset(self, dataset):
+        """
+        Adds every row of a TrafficDataset using the typed columns directly, so
+        speeds and flags are never re-parsed from strings.
+        """
+        add = self.add  # local lookup is faster inside the loop
+        for row in zip(
+            dataset["JunctionName"],
+            dataset["timeOfDay"].hours(),
+            dataset["travel_Direction_in"],
+            dataset["travel_Direction_out"],
+            dataset["Weather_Conditions"],
+            dataset["JunctionSpeedLimit"],
+            dataset["VehicleSpeed"],
+            dataset["VehicleType"],
+            dataset["elctricHybrid"],
+        ):
+            add(*row)
+        return self
+
+    def merge(self, other: "OutcomeAccumulator"):
+        """
+        Merges the counters of another accumulator that covers the rows coming
+        after the ones already added (keeps the first-seen order of the hours).
+        """
+        for name in (
+            "total",
+            "trucks",
+            "electric",
+            "two_wheeled",
+            "bicycles",
+            "buses_north_elm",
+            "same_direction",
+            "over_speed_limit",
+            "elm_vehicles",
+            "elm_scooters",
+            "hanley_vehicles",
+        ):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        for own, theirs in (
+            (self.hour_count, other.hour_count),
+            (self.hanley_hour_count, other.hanley_hour_count),
+        ):
+            for hour, count in theirs.items():
+                own[hour] = own.get(hour, 0) + count
+        self.rain_hours |= other.rain_hours
+        return self
+
+    def outcomes(self) -> dict:
+        """
+        Builds the outcome dictionary in the same order and format as process_csv_data.
+        """
+        outcomes = {}
+        outcomes[
+            "The total number of vehicles passing through all junctions for the selected date"
+        ] = self.total
+        outcomes[
+            "The total number of trucks passing through all junctions for the selected date"
+        ] = self.trucks
+        outcomes[
+            "The total number of electric vehicles passing through all junctions for the selected date"
+        ] = self.electric
+        outcomes[
+            "The number of “two wheeled” vehicles through all junctions for the date (bikes, motorbike, scooters)"
+        ] = self.two_wheeled
+        outcomes[
+            "The total number of busses leaving Elm Avenue/Rabbit Road junction heading north"
+        ] = self.buses_north_elm
+        outcomes[
+            "The total number of vehicles passing through both junctions without turning left or right"
+        ] = self.same_direction
+        outcomes[
+            "The percentage of all vehicles recorded that are Trucks for the selected date (rounded to an integer)"
+        ] = calculate_percentage(self.trucks, self.total)
+        outcomes[
+            "The average number of Bicycles per hour for the selected date (rounded to an integer)"
+        ] = round(self.bicycles / 24)
+        outcomes[
+            "The total number of vehicles recorded as over the speed limit for the selected date"
+        ] = self.over_speed_limit
+        outcomes[
+            "The total number of vehicles recorded through only Elm Avenue/Rabbit Road junction for the selected date"
+        ] = self.elm_vehicles
+        outcomes[
+            "The total number of vehicles recorded through only Hanley Highway/Westway junction for the selected date"
+        ] = self.hanley_vehicles
+        outcomes[
+            "The percentage of vehicles through Elm Avenue/Rabbit Road that are Scooters (rounded to integer)"
+        ] = calculate_percentage(self.elm_scooters, self.elm_vehicles, int)
+        outcomes[
+            "The number of vehicles recorded in the peak (busiest) hour on Hanley Highway/Westway"
+        ] = max(self.hanley_hour_count.values())
+        outcomes["The total number of hours of rain on the selected date"] = len(
+            self.rain_hours
+        )
+        outcomes["The peak hour for traffic during the selected date"] = (
+            find_peak_traffic_hour(self.hour_count)
+        )
+        return outcomes
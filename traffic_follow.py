@@ -0,0 +1,137 @@
+# Author: B.G Ranuga Gamage
+# Date: 3/12/2024
+# Student ID: 20231264
+
+import argparse
+import os
+import time
+
+from traffic_engine import OutcomeAccumulator
+from w2120198_abc import display_outcomes
+
+ENGINE_COLUMNS = (
+    "JunctionName",
+    "timeOfDay",
+    "travel_Direction_in",
+    "travel_Direction_out",
+    "Weather_Conditions",
+    "JunctionSpeedLimit",
+    "VehicleSpeed",
+    "VehicleType",
+    "elctricHybrid",
+)
+
+
+class TrafficFollower:
+    def __init__(self, file_path: str):
+        """
+        Follows a traffic data file that is still being written, parsing only
+        the bytes appended since the last poll and updating the outcomes
+        incrementally.
+        """
+        self.file_path = file_path
+        self.offset = 0  # bytes of the file consumed so far
+        self.pending = b""  # an incomplete last line, kept for the next poll
+        self.header = None  # column names, read from the first line
+        self.positions = None  # position of every engine column in a row
+        self.accumulator = OutcomeAccumulator()
+        self.listeners = []  # called with the new rows (lists of fields) per poll
+
+    def reset(self):
+        """Starts again from the beginning, e.g. when the file was truncated."""
+        listeners = self.listeners
+        self.__init__(self.file_path)
+        self.listeners = listeners
+
+    def _add_line(self, line: str):
+        fields = line.split(",")
+        (
+            junction,
+            time_of_day,
+            dir_in,
+            dir_out,
+            weather,
+            speed_limit,
+            speed,
+            vehicle_type,
+            electric,
+        ) = [fields[position] for position in self.positions]
+        self.accumulator.add(
+            junction,
+            int(time_of_day[:2]),
+            dir_in,
+            dir_out,
+            weather,
+            int(speed_limit),
+            int(speed),
+            vehicle_type,
+            electric == "True",
+        )
+        return fields
+
+    def poll(self) -> int:
+        """
+        Reads the bytes appended since the last poll and adds the complete rows.
+        Returns the number of new rows.
+        """
+        size = os.path.getsize(self.file_path)
+        if size < self.offset:  # the file was replaced or truncated
+            self.reset()
+        if size == self.offset:
+            return 0
+        with open(self.file_path, "rb") as file:
+            file.seek(self.offset)
+            chunk = file.read(size - self.offset)
+        self.offset += len(chunk)
+        chunk = self.pending + chunk
+        complete, _, self.pending = chunk.rpartition(b"\n")
+        if not complete:
+            return 0
+        lines = complete.decode().split("\n")
+        if self.positions is None:  # the first line is the header
+            self.header = lines.pop(0).strip().split(",")
+            self.positions = [self.header.index(column) for column in ENGINE_COLUMNS]
+        rows = [self._add_line(line.strip()) for line in lines if line.strip()]
+        for listener in self.listeners:
+            listener(rows)
+        return len(rows)
+
+    def outcomes(self):
+        """Returns the current outcomes, or None while there are no rows yet."""
+        accumulator = self.accumulator
+        if not accumulator.hanley_hour_count or not accumulator.elm_vehicles:
+            return None  # the outcomes need rows from both junctions
+        return self.accumulator.outcomes()
+
+    def follow(self, interval: float = 5.0, on_update=display_outcomes, stop=None):
+        """
+        Polls the file every `interval` seconds and calls on_update with the
+        refreshed outcomes whenever new rows arrived, until stop() returns True.
+        """
+        while stop is None or not stop():
+            if self.poll():
+                outcomes = self.outcomes()
+                if outcomes is not None:
+                    on_update(outcomes)
+            time.sleep(interval)
+
+
+def main(argv=None):
+    """
+    Command line entry point, for example:
+    python traffic_follow.py traffic_data15062024.csv --interval 10
+    """
+    parser = argparse.ArgumentParser(
+        description="Follow a growing traffic data file and print updated outcomes."
+    )
+    parser.add_argument("file_path")
+    parser.add_argument("--interval", type=float, default=5.0)
+    args = parser.parse_args(argv)
+    try:
+        TrafficFollower(args.file_path).follow(args.interval)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
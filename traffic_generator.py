@@ -0,0 +1,136 @@
+# Author: B.G Ranuga Gamage
+# Date: 3/12/2024
+# Student ID: 20231264
+
+import argparse
+import datetime
+import os
+import random
+
+from traffic_batch import parse_date
+from w2120198_abc import get_csv_file_name
+
+HEADER = (
+    "JunctionName,Date,timeOfDay,travel_Direction_in,travel_Direction_out,"
+    "Weather_Conditions,JunctionSpeedLimit,VehicleSpeed,VehicleType,elctricHybrid"
+)
+JUNCTIONS = (("Elm Avenue/Rabbit Road", 30), ("Hanley Highway/Westway", 20))
+# relative traffic per hour: quiet nights, morning and evening rush hours
+HOUR_WEIGHTS = (
+    25, 27, 33, 36, 18, 34, 39, 55, 133, 111, 57, 46,
+    57, 64, 51, 22, 38, 109, 145, 70, 54, 39, 29, 42,
+)  # fmt: skip
+VEHICLE_TYPES = (
+    ("Car", 340),
+    ("Bicycle", 230),
+    ("Van", 218),
+    ("Motorcycle", 147),
+    ("Truck", 138),
+    ("Buss", 135),
+    ("Scooter", 126),
+)
+DIRECTIONS_IN = (
+    ("SW", 412), ("S", 194), ("N", 184), ("NW", 143),
+    ("W", 140), ("E", 133), ("SE", 68), ("NE", 60),
+)  # fmt: skip
+DIRECTIONS_OUT = (
+    ("SW", 231), ("SE", 213), ("N", 197), ("NW", 192),
+    ("W", 171), ("S", 147), ("E", 136), ("NE", 47),
+)  # fmt: skip
+WEATHER = (
+    ("Clear", 30),
+    ("Bright", 15),
+    ("Overcast", 25),
+    ("Light Rain", 20),
+    ("Heavy Rain", 10),
+)
+ELECTRIC_SHARE = 0.33
+BATCH_ROWS = 100_000  # rows generated and written per batch
+
+
+def _choices(rng, table, count):
+    values, weights = zip(*table)
+    return rng.choices(values, weights, k=count)
+
+
+def hourly_weather(rng) -> list:
+    """Weather changes slowly, so it is drawn per hour and kept for a few hours."""
+    weather, current = [], None
+    for hour in range(24):
+        if current is None or rng.random() < 0.3:
+            current = _choices(rng, WEATHER, 1)[0]
+        weather.append(current)
+    return weather
+
+
+def generate_rows(date: datetime.date, rows: int, seed: int = 0):
+    """
+    Yields CSV lines (without the line ending) for a synthetic survey day.
+    The same date, row count and seed always give the same lines.
+    """
+    rng = random.Random(f"{seed}-{date.isoformat()}-{rows}")
+    weather = hourly_weather(rng)
+    date_text = f"{date:%d/%m/%Y}"
+    produced = 0
+    while produced < rows:
+        count = min(BATCH_ROWS, rows - produced)
+        hours = rng.choices(range(24), HOUR_WEIGHTS, k=count)
+        junctions = rng.choices(JUNCTIONS, k=count)
+        types = _choices(rng, VEHICLE_TYPES, count)
+        directions_in = _choices(rng, DIRECTIONS_IN, count)
+        directions_out = _choices(rng, DIRECTIONS_OUT, count)
+        for idx in range(count):
+            junction, limit = junctions[idx]
+            speed = min(max(int(rng.gauss(limit * 0.6, limit * 0.35)), 1), limit + 15)
+            yield (
+                f"{junction},{date_text},"
+                f"{hours[idx]:02d}:{rng.randrange(60):02d}:{rng.randrange(60):02d},"
+                f"{directions_in[idx]},{directions_out[idx]},{weather[hours[idx]]},"
+                f"{limit},{speed},{types[idx]},{rng.random() < ELECTRIC_SHARE}"
+            )
+        produced += count
+
+
+def generate_day_file(
+    date: datetime.date, rows: int, directory: str = "./", seed: int = 0
+) -> str:
+    """
+    Writes traffic_dataDDMMYYYY.csv with the same schema and CRLF line endings
+    as the survey files, streaming the rows so any size fits in memory.
+    """
+    file_path = os.path.join(
+        directory, get_csv_file_name(date.day, date.month, date.year)
+    )
+    with open(file_path, "w", newline="") as file:
+        file.write(HEADER + "\r\n")
+        batch = []
+        for line in generate_rows(date, rows, seed):
+            batch.append(line)
+            if len(batch) == BATCH_ROWS:
+                file.write("\r\n".join(batch) + "\r\n")
+                batch = []
+        if batch:
+            file.write("\r\n".join(batch) + "\r\n")
+    return file_path
+
+
+def main(argv=None):
+    """
+    Command line entry point, for example:
+    python traffic_generator.py 01/06/2024 --rows 1000000 --directory synthetic
+    """
+    parser = argparse.ArgumentParser(description="Generate synthetic traffic data.")
+    parser.add_argument("date", type=parse_date, help="DD/MM/YYYY")
+    parser.add_argument("--days", type=int, default=1, help="consecutive days")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--directory", default="./")
+    args = parser.parse_args(argv)
+    os.makedirs(args.directory, exist_ok=True)
+    for offset in range(args.days):
+        date = args.date + datetime.timedelta(days=offset)
+        print(generate_day_file(date, args.rows, args.directory, args.seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+# Author: B.G Ranuga Gamage
+# Date: 3/12/2024
+# Student ID: 20231264
+
+import heapq
+from array import array
+from bisect import bisect_left
+from itertools import accumulate, repeat
+
+from traffic_dataset import BitColumn, CategoryColumn
+from traffic_vector import as_array, get_numpy
+
+# row positions of the set bits in every possible byte
+_BYTE_POSITIONS = [
+    tuple(bit for bit in range(8) if byte >> bit & 1) for byte in range(256)
+]
+
+
+def _bitmaps_from_codes(codes, value_count: int) -> list:
+    """Builds one bitmap (a Python int, bit i = row i) per code in one pass."""
+    size = (len(codes) + 7) >> 3
+    maps = [bytearray(size) for _ in range(value_count)]
+    for idx, code in enumerate(codes):
+        maps[code][idx >> 3] |= 1 << (idx & 7)
+    return [int.from_bytes(bitmap, "little") for bitmap in maps]
+
+
+def rows_bitmap(rows, row_count: int) -> int:
+    """Returns the bitmap with the bits of the given rows set."""
+    bits = bytearray((row_count + 7) >> 3)
+    for row in rows:
+        bits[row >> 3] |= 1 << (row & 7)
+    return int.from_bytes(bits, "little")
+
+
+def bitmap_rows(bitmap: int) -> list:
+    """Returns the row indexes of the set bits, in ascending order."""
+    rows = []
+    raw = bitmap.to_bytes((bitmap.bit_length() + 7) >> 3, "little")
+    for offset, byte in enumerate(raw):
+        if byte:
+            base = offset << 3
+            rows.extend(base + bit for bit in _BYTE_POSITIONS[byte])
+    return rows
+
+
+class ColumnIndex:
+    def __init__(self, column):
+        """
+        Value -> bitmap index for a dictionary-encoded or boolean column.
+        Values are the same strings that appear in the CSV file.
+        """
+        if isinstance(column, CategoryColumn):
+            bitmaps = _bitmaps_from_codes(column.codes, len(column.values))
+            self.bitmaps = dict(zip(column.values, bitmaps))
+        elif isinstance(column, BitColumn):
+            true_rows = int.from_bytes(column.bits, "little")  # already packed
+            all_rows = (1 << len(column)) - 1
+            self.bitmaps = {"True": true_rows, "False": all_rows & ~true_rows}
+        else:
+            raise TypeError(f"cannot index a {type(column).__name__}")
+
+    def bitmap(self, values) -> int:
+        """Returns the OR of the bitmaps of the given values."""
+        if isinstance(values, str):
+            values = [values]
+        result = 0
+        for value in values:
+            result |= self.bitmaps.get(value, 0)
+        return result
+
+
+class DatasetIndex:
+    def __init__(self, dataset):
+        """
+        Bitmap indexes over the categorical and boolean columns of a dataset.
+        Each column is indexed once, the first time it is filtered on.
+        """
+        self.dataset = dataset
+        self.row_count = dataset.row_count()
+        self.all_rows = (1 << self.row_count) - 1
+        self.columns = {}
+        self.time_bins = {}  # bin minutes -> TimeBins (traffic_bins)
+        self.time_order = None  # TimeOrder, built on first time range scan
+
+    def column(self, name: str) -> ColumnIndex:
+        if name not in self.columns:
+            self.columns[name] = ColumnIndex(self.dataset[name])
+        return self.columns[name]
+
+    def where(self, column: str, values) -> int:
+        """Bitmap of the rows where column is any of values."""
+        return self.column(column).bitmap(values)
+
+    def select(self, filters: dict) -> int:
+        """
+        Bitmap of the rows matching every column filter, for example
+        {"VehicleType": ["Bus"], "travel_Direction_out": ["N"]}.
+        """
+        result = self.all_rows
+        for column, values in filters.items():
+            result &= self.where(column, values)
+            if not result:
+                break
+        return result
+
+    def invert(self, bitmap: int) -> int:
+        return self.all_rows & ~bitmap
+
+    def count(self, bitmap: int) -> int:
+        return bitmap.bit_count()
+
+    def rows(self, bitmap: int) -> list:
+        return bitmap_rows(bitmap)
+
+
+def _counting_sort(seconds) -> tuple:
+    """
+    Returns the stable permutation that sorts the rows by seconds of day and
+    the sorted seconds, in linear time: count every second, turn the counts
+    into start positions and place every row at the next free position.
+    """
+    np = get_numpy()
+    if np is not None and len(seconds):
+        # the same in two passes of NumPy's radix sort (16 then 1 bit keys)
+        values = as_array(seconds)
+        order = np.argsort((values & 0xFFFF).astype(np.uint16), kind="stable")
+        high = (values[order] >> 16).astype(np.uint8)
+        order = order[np.argsort(high, kind="stable")]
+        return (
+            array("I", order.astype(np.uint32).tobytes()),
+            array("i", values[order].astype(np.int32).tobytes()),
+        )
+    counts = [0] * (max(seconds, default=0) + 1)
+    for value in seconds:
+        counts[value] += 1
+    starts = list(accumulate(counts, initial=0))
+    order = array("I", bytes(4 * len(seconds)))
+    for row, value in enumerate(seconds):
+        order[starts[value]] = row
+        starts[value] += 1
+    sorted_seconds = array("i")
+    for value, count in enumerate(counts):
+        if count:
+            sorted_seconds.extend(repeat(value, count))
+    return order, sorted_seconds
+
+
+class TimeOrder:
+    def __init__(self, seconds):
+        """
+        Permutation index that lists the rows in time of day order (rows with
+        the same time keep their file order), with the sorted seconds next to
+        it so time ranges are found by binary search.
+        """
+        self.order, self.seconds = _counting_sort(seconds)
+
+    def bounds(self, start: int, end: int) -> tuple:
+        """Positions in self.order of the rows with start <= seconds < end."""
+        return bisect_left(self.seconds, start), bisect_left(self.seconds, end)
+
+    def rows_between(self, start: int, end: int):
+        """The rows with start <= seconds < end, in time order."""
+        first, last = self.bounds(start, end)
+        return self.order[first:last]
+
+    def __len__(self):
+        return len(self.order)
+
+    def __iter__(self):
+        return iter(self.order)
+
+
+def get_time_order(dataset) -> TimeOrder:
+    """Returns the time order of the dataset, building it on first use."""
+    index = get_index(dataset)
+    if index.time_order is None:
+        index.time_order = TimeOrder(dataset["timeOfDay"].seconds)
+    return index.time_order
+
+
+def merge_time_orders(datasets):
+    """
+    Yields (seconds, dataset position, row) for the rows of several days in
+    time of day order, merging their time orders sequentially.
+    """
+
+    def rows(position, time_order):
+        for seconds, row in zip(time_order.seconds, time_order.order):
+            yield seconds, position, row
+
+    return heapq.merge(
+        *(
+            rows(position, get_time_order(dataset))
+            for position, dataset in enumerate(datasets)
+        )
+    )
+
+
+def get_index(dataset) -> DatasetIndex:
+    """Returns the index of the dataset, building it on first use."""
+    index = getattr(dataset, "index", None)
+    if index is None:
+        index = dataset.index = DatasetIndex(dataset)
+    return index
+
+
+def is_indexable(dataset, column: str) -> bool:
+    return isinstance(dataset[column], (CategoryColumn, BitColumn))
@@ -0,0 +1,182 @@
+# Author: B.G Ranuga Gamage
+# Date: 3/12/2024
+# Student ID: 20231264
+
+import argparse
+import sys
+import tracemalloc
+
+from traffic_dataset import BitColumn, CategoryColumn, IntColumn, TimeColumn
+
+
+def deep_sizeof(value, seen=None) -> int:
+    """
+    Returns the bytes held by a value and everything it references (dicts,
+    lists, tuples, sets), counting shared objects once.
+    """
+    seen = set() if seen is None else seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(
+            deep_sizeof(key, seen) + deep_sizeof(item, seen)
+            for key, item in value.items()
+        )
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, seen) for item in value)
+    return size
+
+
+def _buffer_bytes(buffer) -> tuple:
+    """Returns (heap bytes, memory-mapped bytes) of an array or memoryview."""
+    if isinstance(buffer, memoryview):
+        return sys.getsizeof(buffer), buffer.nbytes  # data lives in the mapped file
+    return sys.getsizeof(buffer), 0
+
+
+def column_memory(column) -> dict:
+    """Returns the encoding, heap bytes and memory-mapped bytes of a column."""
+    if isinstance(column, CategoryColumn):
+        heap, mapped = _buffer_bytes(column.codes)
+        heap += deep_sizeof(column.values) + deep_sizeof(column.lookup)
+        encoding = f"dictionary ({len(column.values)} values)"
+    elif isinstance(column, IntColumn):
+        heap, mapped = _buffer_bytes(column.data)
+        encoding = "int array"
+    elif isinstance(column, BitColumn):
+        heap, mapped = _buffer_bytes(column.bits)
+        encoding = "bit packed"
+    elif isinstance(column, TimeColumn):
+        heap, mapped = _buffer_bytes(column.seconds)
+        encoding = "seconds array"
+    else:
+        heap, mapped = deep_sizeof(column.data), 0
+        encoding = "str list"
+    return {"encoding": encoding, "heap_bytes": heap, "mapped_bytes": mapped}
+
+
+def dataset_memory(dataset) -> dict:
+    """Returns column_memory() for every column of a dataset."""
+    return {name: column_memory(column) for name, column in dataset.columns.items()}
+
+
+def measure_peak(function, *args, top: int = 5):
+    """
+    Runs function(*args) under tracemalloc and returns (result, peak bytes,
+    the `top` source lines that allocated the most during the call).
+    """
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    before = tracemalloc.take_snapshot()
+    result = function(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    if not was_tracing:
+        tracemalloc.stop()
+    ignore = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    after, before = after.filter_traces(ignore), before.filter_traces(ignore)
+    allocations = [
+        (str(stat.traceback), stat.size_diff)
+        for stat in after.compare_to(before, "lineno")[:top]
+    ]
+    return result, peak, allocations
+
+
+def _compute(dataset, backend: str) -> dict:
+    """The processing stage alone: the outcome pass over a loaded dataset."""
+    from traffic_vector import accumulate
+
+    return accumulate(dataset, backend).outcomes()
+
+
+def memory_report(file_path: str, features: bool = True) -> dict:
+    """
+    Loads and processes a day file and reports the bytes held by each column,
+    by the MultiCSVProcessor features dict and the peak allocation of each stage.
+    The dataset is parsed from the file, then the outcomes are computed from
+    that loaded dataset, so the two peaks separate parsing from computation.
+    """
+    # every module a stage uses is imported before tracing starts, so the top
+    # allocations are the data and not importlib frames
+    import traffic_cache  # noqa: F401
+    import traffic_tokenizer  # noqa: F401
+    from traffic_vector import get_numpy, select_backend
+    from w2120198_abc import load_csv_file
+
+    backend = select_backend()
+    if backend == "numpy":
+        get_numpy()
+    dataset, load_peak, load_top = measure_peak(load_csv_file, file_path)
+    _, process_peak, process_top = measure_peak(_compute, dataset, backend)
+    columns = dataset_memory(dataset)
+    report = {
+        "file": file_path,
+        "rows": dataset.row_count(),
+        "columns": columns,
+        "dataset_bytes": sum(column["heap_bytes"] for column in columns.values()),
+        "load_peak_bytes": load_peak,
+        "load_top_allocations": load_top,
+        "backend": backend,
+        "process_peak_bytes": process_peak,
+        "process_top_allocations": process_top,
+    }
+    if features:
+        # imported here: only the features report needs graphics and tkinter
+        from w2120198_de import MultiCSVProcessor
+
+        processor = MultiCSVProcessor()
+        _, features_peak, _ = measure_peak(processor.load_csv_file, file_path)
+        report["features_bytes"] = deep_sizeof(processor.current_data)
+        report["features_peak_bytes"] = features_peak
+    return report
+
+
+def format_report(report: dict) -> str:
+    lines = [f"{report['file']} ({report['rows']:,} rows)"]
+    lines.append(f"{'column':<24}{'encoding':<28}{'heap bytes':>12}{'mapped':>12}")
+    for name, column in report["columns"].items():
+        lines.append(
+            f"{name:<24}{column['encoding']:<28}"
+            f"{column['heap_bytes']:>12,}{column['mapped_bytes']:>12,}"
+        )
+    lines.append(f"{'total (loaded dataset)':<52}{report['dataset_bytes']:>12,}")
+    if "features_bytes" in report:
+        lines.append(f"MultiCSVProcessor features: {report['features_bytes']:,} bytes")
+        lines.append(
+            f"Peak during features load: {report['features_peak_bytes']:,} bytes"
+        )
+    lines.append(f"Peak during load_csv_file: {report['load_peak_bytes']:,} bytes")
+    lines.append(
+        f"Peak during processing ({report['backend']}): "
+        f"{report['process_peak_bytes']:,} bytes"
+    )
+    for title, key in (
+        ("Top allocations while loading", "load_top_allocations"),
+        ("Top allocations while computing the outcomes", "process_top_allocations"),
+    ):
+        lines.append(f"{title}:")
+        for where, size in report[key]:
+            lines.append(f"  {size:>12,}  {where}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """
+    Command line entry point, for example:
+    python traffic_memory.py traffic_data15062024.csv
+    """
+    parser = argparse.ArgumentParser(description="Memory used by a loaded day.")
+    parser.add_argument("file_path")
+    parser.add_argument(
+        "--no-features", action="store_true", help="skip MultiCSVProcessor"
+    )
+    args = parser.parse_args(argv)
+    print(format_report(memory_report(args.file_path, not args.no_features)))
+
+
+if __name__ == "__main__":
+    main()
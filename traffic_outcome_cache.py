@@ -0,0 +1,143 @@
+# Author: B.G Ranuga Gamage
+# Date: 3/12/2024
+# Student ID: 20231264
+
+import json
+import os
+
+from traffic_cache import file_hash
+from traffic_engine import METRICS_VERSION
+
+OUTCOME_CACHE_DIR = ".outcome_cache"
+OUTCOME_CACHE_MAX_BYTES = 64 << 20
+FINGERPRINTS_DIR = "fingerprints"  # one small file per CSV path
+
+
+def _write_json(path: str, value):
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump(value, file, ensure_ascii=False)
+    os.replace(temp_path, path)  # readers never see a half written file
+
+
+class OutcomeCache:
+    def __init__(self, directory=OUTCOME_CACHE_DIR, max_bytes=OUTCOME_CACHE_MAX_BYTES):
+        """
+        Persistent cache of computed outcomes, keyed by the SHA-1 of the CSV
+        contents and the metrics version, with least recently used eviction
+        once the cache grows beyond max_bytes.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def _fingerprint_dir(self) -> str:
+        return os.path.join(self.directory, FINGERPRINTS_DIR)
+
+    def _fingerprint_path(self, key: str) -> str:
+        import hashlib
+
+        name = hashlib.sha1(key.encode()).hexdigest()
+        return os.path.join(self._fingerprint_dir(), f"{name}.json")
+
+    def content_hash(self, file_path: str) -> str:
+        """
+        Returns the SHA-1 of the file, reusing the remembered hash while the
+        size and mtime of the file are unchanged. Every path has its own
+        fingerprint file, so processes hashing different files never overwrite
+        each other's fingerprints.
+        """
+        stat = os.stat(file_path)
+        key = os.path.abspath(file_path)
+        path = self._fingerprint_path(key)
+        try:
+            with open(path, encoding="utf-8") as file:
+                known = json.load(file)
+        except (OSError, ValueError):
+            known = None
+        if known and known[:3] == [key, stat.st_size, stat.st_mtime_ns]:
+            return known[3]
+        digest = file_hash(file_path)
+        try:
+            os.makedirs(self._fingerprint_dir(), exist_ok=True)
+            _write_json(path, [key, stat.st_size, stat.st_mtime_ns, digest])
+        except OSError:
+            pass
+        return digest
+
+    def entry_path(self, digest: str) -> str:
+        return os.path.join(self.directory, f"{digest}-v{METRICS_VERSION}.json")
+
+    def get(self, digest: str):
+        """Returns the cached outcomes for the content hash, or None."""
+        path = self.entry_path(digest)
+        try:
+            with open(path, encoding="utf-8") as file:
+                outcomes = json.load(file)
+        except (OSError, ValueError):
+            return None
+        try:
+            os.utime(path)  # mark as recently used for eviction
+        except OSError:
+            pass
+        return outcomes
+
+    def put(self, digest: str, outcomes: dict):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            _write_json(self.entry_path(digest), outcomes)
+            self.evict()
+        except OSError:  # a full or read-only disk should not stop the analysis
+            pass
+
+    def evict(self):
+        """
+        Deletes the least recently used entries until the cache, fingerprints
+        included, fits max_bytes, then forgets the fingerprints of the evicted
+        entries and of files that no longer exist.
+        """
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                stat = os.stat(os.path.join(self.directory, name))
+                entries.append((stat.st_mtime_ns, stat.st_size, name))
+        try:
+            fingerprints = list(os.scandir(self._fingerprint_dir()))
+        except OSError:
+            fingerprints = []
+        total = sum(size for _, size, _ in entries)
+        total += sum(item.stat().st_size for item in fingerprints)
+        evicted = set()
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(os.path.join(self.directory, name))
+            evicted.add(name.rsplit("-v", 1)[0])
+            total -= size
+        self._prune_fingerprints(fingerprints, evicted)
+
+    def _prune_fingerprints(self, fingerprints: list, evicted: set):
+        """
+        Drops the fingerprints of evicted digests and of deleted files. Other
+        fingerprints without an entry may belong to a file another process is
+        still computing, so they are kept.
+        """
+        for item in fingerprints:
+            try:
+                with open(item.path, encoding="utf-8") as file:
+                    key, _, _, digest = json.load(file)
+                if digest in evicted or not os.path.exists(key):
+                    os.remove(item.path)
+            except (OSError, ValueError):
+                pass
+
+    def outcomes(self, file_path: str, compute) -> dict:
+        """
+        Returns the outcomes of file_path from the cache, calling
+        compute(file_path, digest) and storing the result only on a miss.
+        """
+        digest = self.content_hash(file_path)
+        outcomes = self.get(digest)
+        if outcomes is None:
+            outcomes = compute(file_path, digest)
+            self.put(digest, outcomes)
+        return outcomes
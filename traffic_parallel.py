@@ -0,0 +1,133 @@
+# Author: B.G Ranuga Gamage
+# Date: 3/12/2024
+# Student ID: 20231264
+
+import os
+
+from traffic_dataset import TrafficDataset
+from traffic_engine import OutcomeAccumulator
+from traffic_tokenizer import QUOTE, parse_bytes, split_header
+from traffic_trace import traced
+
+MIN_CHUNK_BYTES = 4 << 20  # below this a file is parsed in the calling process
+SCAN_BYTES = 1 << 20  # block size of the quote scan between split points
+
+
+def read_header(file_path: str) -> tuple[list, int]:
+    """Returns the column names and the byte offset where the rows start."""
+    with open(file_path, "rb") as file:
+        header = file.readline()
+    return split_header(header), len(header)
+
+
+def _odd_quotes(file, length: int) -> int:
+    """Reads `length` bytes and returns 1 when they hold an odd number of quotes."""
+    odd = 0
+    while length > 0:
+        block = file.read(min(length, SCAN_BYTES))
+        if not block:
+            break
+        odd ^= block.count(QUOTE) & 1
+        length -= len(block)
+    return odd
+
+
+def split_byte_ranges(file_path: str, chunks: int) -> list:
+    """
+    Splits the rows of the file into at most `chunks` (start, end) byte ranges
+    that all begin and end on a line boundary outside a quoted field. The
+    quotes are counted up to each split point, so a newline inside a quoted
+    field never ends a range (an escaped "" counts twice and keeps the parity).
+    """
+    _, start = read_header(file_path)
+    size = os.path.getsize(file_path)
+    step = max((size - start) // max(chunks, 1), 1)
+    ranges = []
+    with open(file_path, "rb") as file:
+        file.seek(start)
+        while start < size:
+            end = min(start + step, size)
+            if end < size:
+                quoted = _odd_quotes(file, end - file.tell())
+                line = file.readline()  # move the boundary to the next line end
+                quoted ^= line.count(QUOTE) & 1
+                while quoted and line:  # still inside a field: take more lines
+                    line = file.readline()
+                    quoted ^= line.count(QUOTE) & 1
+                end = file.tell()
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def parse_range(file_path: str, columns: list, start: int, end: int) -> TrafficDataset:
+    """Parses the rows between two byte offsets from split_byte_ranges."""
+    with open(file_path, "rb") as file:
+        file.seek(start)
+        return parse_bytes(file.read(end - start), columns)
+
+
+def _parse_task(task):
+    return parse_range(*task).columns  # plain columns pickle cheaply
+
+
+def _aggregate_task(task):
+    return OutcomeAccumulator().add_dataset(parse_range(*task))
+
+
+def _tasks(file_path: str, workers: int) -> list:
+    columns, _ = read_header(file_path)
+    return [
+        (file_path, columns, start, end)
+        for start, end in split_byte_ranges(file_path, workers)
+    ]
+
+
+def _use_pool(file_path: str, workers: int) -> bool:
+    return workers > 1 and os.path.getsize(file_path) >= 2 * MIN_CHUNK_BYTES
+
+
+def should_parallelise(file_path: str, workers: int = None) -> bool:
+    """True when the file is large enough to be parsed on `workers` processes."""
+    return _use_pool(file_path, workers or os.cpu_count() or 1)
+
+
+@traced()
+def load_csv_file_parallel(file_path: str, workers: int = None) -> TrafficDataset:
+    """
+    Parses the file in line-aligned byte ranges on a process pool and merges
+    the per-chunk columns, in file order, into one TrafficDataset.
+    """
+    workers = workers or os.cpu_count() or 1
+    tasks = _tasks(file_path, workers)
+    dataset = TrafficDataset(read_header(file_path)[0])
+    if not _use_pool(file_path, workers):
+        for task in tasks:
+            dataset.extend(parse_range(*task))
+        return dataset
+    from concurrent.futures import ProcessPoolExecutor  # loaded only for a pool
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for columns in pool.map(_parse_task, tasks):  # map keeps the chunk order
+            dataset.extend(TrafficDataset.from_columns(columns))
+    return dataset
+
+
+def process_csv_data_parallel(file_path: str, workers: int = None) -> dict:
+    """
+    Same outcomes as process_csv_data, but every worker reduces its chunk to an
+    OutcomeAccumulator so only the small partial aggregates are sent back.
+    """
+    workers = workers or os.cpu_count() or 1
+    tasks = _tasks(file_path, workers)
+    total = OutcomeAccumulator()
+    if not _use_pool(file_path, workers):
+        for task in tasks:
+            total.merge(_aggregate_task(task))
+        return total.outcomes()
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for partial in pool.map(_aggregate_task, tasks):
+            total.merge(partial)
+    return total.outcomes()
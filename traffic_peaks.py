@@ -0,0 +1,139 @@
+# Author: B.G Ranuga Gamage
+# Date: 3/12/2024
+# Student ID: 20231264
+
+import heapq
+from collections import namedtuple
+
+from traffic_dataset import format_time
+from traffic_index import get_time_order
+from traffic_vector import get_numpy
+
+Window = namedtuple("Window", "start end count")  # seconds of day, end exclusive
+
+
+def window_counts(times, width: int) -> list:
+    """
+    For time-sorted seconds, returns the number of records in the window
+    [times[i], times[i] + width) for every i, with a two-pointer sweep.
+    """
+    np = get_numpy()
+    if np is not None and len(times) > 1:
+        sorted_times = np.asarray(times)
+        ends = np.searchsorted(sorted_times, sorted_times + width, side="left")
+        return (ends - np.arange(len(sorted_times))).tolist()
+    counts = []
+    end = 0
+    for start_idx, start in enumerate(times):
+        if end < start_idx:
+            end = start_idx
+        while end < len(times) and times[end] < start + width:
+            end += 1
+        counts.append(end - start_idx)
+    return counts
+
+
+def _windows(times, width: int):
+    """Yields one Window per distinct start time (the first record at that time)."""
+    previous = None
+    for start, count in zip(times, window_counts(times, width)):
+        if start != previous:  # later records at the same second see fewer rows
+            yield Window(start, start + width, count)
+            previous = start
+
+
+def peak_windows(times, width: int) -> list:
+    """
+    Returns every busiest window of `width` seconds, in time order. A busiest
+    window can always be slid right until it starts at a record, so checking
+    the windows that start at each record finds all of them, ties included.
+    """
+    windows = list(_windows(times, width))
+    if not windows:
+        return []
+    best = max(window.count for window in windows)
+    return [window for window in windows if window.count == best]
+
+
+def top_windows(times, width: int, k: int = 3, overlapping: bool = False) -> list:
+    """
+    Returns the k busiest windows, busiest (then earliest) first. Unless
+    overlapping is True, windows that overlap an already chosen one are skipped.
+    """
+    heap = [(-window.count, window.start, window) for window in _windows(times, width)]
+    if overlapping:
+        return [window for _, _, window in heapq.nsmallest(k, heap)]
+    heapq.heapify(heap)
+    chosen = []
+    while heap and len(chosen) < k:
+        window = heapq.heappop(heap)[2]
+        if all(
+            window.end <= other.start or other.end <= window.start for other in chosen
+        ):
+            chosen.append(window)
+    return chosen
+
+
+def junction_times(dataset) -> dict:
+    """Returns {junction: time-sorted seconds} plus None for every junction."""
+    junction = dataset["JunctionName"]
+    time_order = get_time_order(dataset)
+    times = {value: [] for value in junction.values}
+    appends = [times[value].append for value in junction.values]
+    codes = junction.codes
+    for row, seconds in zip(time_order.order, time_order.seconds):
+        appends[codes[row]](seconds)  # already in time order, no sorting needed
+    times[None] = list(time_order.seconds)
+    return times
+
+
+def junction_peaks(dataset, minutes: int = 60) -> dict:
+    """
+    Returns {junction: [Window]} with the busiest rolling windows of `minutes`
+    at each junction, and under None for all junctions together.
+    """
+    return {
+        junction: peak_windows(times, minutes * 60)
+        for junction, times in junction_times(dataset).items()
+    }
+
+
+def format_window(window: Window) -> str:
+    end = min(window.end, 24 * 3600)
+    return (
+        f"Between {format_time(window.start)} and {format_time(end)}"
+        f" ({window.count} vehicles)"
+    )
+
+
+def main(argv=None):
+    """
+    Command line entry point, for example:
+    python traffic_peaks.py traffic_data15062024.csv --minutes 30 --top 3
+    """
+    import argparse
+
+    from traffic_cache import load_cached_dataset
+    from w2120198_abc import load_csv_file
+
+    parser = argparse.ArgumentParser(description="Busiest rolling time windows.")
+    parser.add_argument("file_path")
+    parser.add_argument("--minutes", type=int, default=60, help="window length")
+    parser.add_argument("--top", type=int, default=0, help="also list the k busiest")
+    args = parser.parse_args(argv)
+    if args.minutes <= 0:
+        parser.error("--minutes must be positive")
+    dataset = load_cached_dataset(
+        args.file_path, load_csv_file, ("JunctionName", "timeOfDay")
+    )
+    width = args.minutes * 60
+    for junction, times in junction_times(dataset).items():
+        print(f"{junction or 'All junctions'}:")
+        for window in peak_windows(times, width):
+            print(f"  peak   {format_window(window)}")
+        for window in top_windows(times, width, args.top):
+            print(f"  top    {format_window(window)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+# Author: B.G Ranuga Gamage
+# Date: 3/12/2024
+# Student ID: 20231264
+
+import operator
+
+from traffic_dataset import IntColumn, TimeColumn
+from traffic_index import (
+    bitmap_rows,
+    get_index,
+    get_time_order,
+    is_indexable,
+    rows_bitmap,
+)
+
+COMPARISONS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "in": lambda value, values: value in values,
+    "not in": lambda value, values: value not in values,
+    "between": lambda value, bounds: bounds[0] <= value <= bounds[1],
+}
+AGGREGATES = ("count", "sum", "mean", "min", "max")
+SECONDS_PER_DAY = 24 * 3600
+
+
+class ColumnRef:
+    def __init__(self, name: str):
+        """
+        Refers to another column in a predicate, e.g. VehicleSpeed > JunctionSpeedLimit.
+        """
+        self.name = name
+
+    def __eq__(self, other):
+        return isinstance(other, ColumnRef) and other.name == self.name
+
+    def __hash__(self):
+        return hash(("ColumnRef", self.name))
+
+    def __repr__(self):
+        return f"ColumnRef({self.name!r})"
+
+
+def _freeze(value):
+    """Makes predicate values hashable so equal filters can be shared."""
+    if isinstance(value, (list, set, tuple, frozenset)):
+        return tuple(value)
+    return value
+
+
+def _time_to_seconds(value):
+    if isinstance(value, str):
+        hours, minutes, *seconds = value.split(":")
+        return int(hours) * 3600 + int(minutes) * 60 + int(seconds[0] if seconds else 0)
+    return value
+
+
+def column_values(dataset, name: str):
+    """
+    Returns an indexable sequence of typed values for a column: ints for
+    numeric columns, seconds for timeOfDay and the hour (0-23) for "hour".
+    """
+    if name == "hour":
+        return [seconds // 3600 for seconds in dataset["timeOfDay"].seconds]
+    column = dataset[name]
+    if isinstance(column, IntColumn):
+        return column.data
+    if isinstance(column, TimeColumn):
+        return column.seconds
+    return column  # decoded on access
+
+
+class Query:
+    def __init__(self, dataset, predicates=(), group_by=(), aggregates=()):
+        """
+        Immutable description of a question over one loaded day. Every method
+        returns a new Query, so partial queries can be shared and extended.
+        """
+        self.dataset = dataset
+        self.predicates = tuple(predicates)
+        self.group_keys = tuple(group_by)
+        self.aggregates = tuple(aggregates)
+
+    def _with(self, **changes) -> "Query":
+        fields = {
+            "predicates": self.predicates,
+            "group_by": self.group_keys,
+            "aggregates": self.aggregates,
+        }
+        fields.update(changes)
+        return Query(self.dataset, **fields)
+
+    def where(self, column: str, op: str, value=None) -> "Query":
+        """Adds a predicate such as where("VehicleType", "in", ["Bus", "Truck"])."""
+        if op not in COMPARISONS:
+            raise ValueError(f"unknown comparison {op!r}")
+        if op in ("in", "not in") and isinstance(value, str):
+            value = (value,)  # one value, not its characters or a substring test
+        return self._with(predicates=self.predicates + ((column, op, _freeze(value)),))
+
+    def group_by(self, *columns) -> "Query":
+        """Groups by columns, "hour" groups by the hour of timeOfDay."""
+        return self._with(group_by=self.group_keys + columns)
+
+    def aggregate(self, function: str, column: str = None) -> "Query":
+        if function not in AGGREGATES:
+            raise ValueError(f"unknown aggregate {function!r}")
+        return self._with(aggregates=self.aggregates + ((function, column),))
+
+    def count(self) -> "Query":
+        return self.aggregate("count")
+
+    def sum(self, column: str) -> "Query":
+        return self.aggregate("sum", column)
+
+    def mean(self, column: str) -> "Query":
+        return self.aggregate("mean", column)
+
+    def min(self, column: str) -> "Query":
+        return self.aggregate("min", column)
+
+    def max(self, column: str) -> "Query":
+        return self.aggregate("max", column)
+
+    def run(self) -> dict:
+        return run_queries(self.dataset, [self])[0]
+
+
+def query(dataset) -> Query:
+    """Starts a query over a loaded TrafficDataset."""
+    return Query(dataset)
+
+
+def aggregate_name(function: str, column: str) -> str:
+    return function if column is None else f"{function}({column})"
+
+
+def _index_bitmap(dataset, predicate):
+    """
+    Pushes an equality/membership predicate on a categorical column down to
+    its bitmap index, returning None when the predicate cannot be pushed down.
+    """
+    column, op, value = predicate
+    if column not in dataset or not is_indexable(dataset, column):
+        return None
+    if op not in ("==", "!=", "in", "not in") or isinstance(value, ColumnRef):
+        return None
+    index = get_index(dataset)
+    values = value if op in ("in", "not in") else (value,)
+    values = [str(item) for item in values]  # booleans are indexed as "True"/"False"
+    bitmap = index.where(column, values)
+    return index.invert(bitmap) if op in ("!=", "not in") else bitmap
+
+
+def _time_range(column, op, value):
+    """
+    Turns a comparison on timeOfDay (seconds) or hour into the equivalent
+    [start, end) range of seconds, or None when it is not a single range.
+    """
+    if column == "timeOfDay":
+        unit = 1
+        value = (
+            tuple(map(_time_to_seconds, value))
+            if isinstance(value, tuple)
+            else _time_to_seconds(value)
+        )
+    elif column == "hour":
+        unit = 3600
+    else:
+        return None
+    bounds = value if op == "between" else (value,)
+    if not all(isinstance(bound, int) for bound in bounds):
+        return None
+    if op == "between":
+        low, high = value
+        return low * unit, (high + 1) * unit
+    return {
+        "==": (value * unit, (value + 1) * unit),
+        "<": (0, value * unit),
+        "<=": (0, (value + 1) * unit),
+        ">": ((value + 1) * unit, SECONDS_PER_DAY + 1),
+        ">=": (value * unit, SECONDS_PER_DAY + 1),
+    }.get(op)
+
+
+def _time_bitmap(dataset, predicate):
+    """
+    Pushes a time range predicate down to the time order index: the matching
+    rows are found by binary search instead of a scan of the column.
+    """
+    column, op, value = predicate
+    if isinstance(value, ColumnRef) or "timeOfDay" not in dataset:
+        return None
+    bounds = _time_range(column, op, value)
+    if bounds is None:
+        return None
+    rows = get_time_order(dataset).rows_between(*bounds)
+    return rows_bitmap(rows, dataset.row_count())
+
+
+def _residual_filter(dataset, rows, predicate):
+    """Evaluates a predicate on the typed column values of the given rows."""
+    column, op, value = predicate
+    values = column_values(dataset, column)
+    compare = COMPARISONS[op]
+    if isinstance(value, ColumnRef):
+        others = column_values(dataset, value.name)
+        return [row for row in rows if compare(values[row], others[row])]
+    if column == "timeOfDay":
+        value = (
+            tuple(map(_time_to_seconds, value))
+            if isinstance(value, tuple)
+            else _time_to_seconds(value)
+        )
+    return [row for row in rows if compare(values[row], value)]
+
+
+def filter_rows(dataset, predicates) -> list:
+    """
+    Returns the rows matching every predicate. Categorical and time range
+    predicates are resolved first by ANDing bitmaps, then the remaining
+    predicates are checked only on the rows that are left.
+    """
+    bitmap, residual = None, []
+    for predicate in predicates:
+        pushed = _index_bitmap(dataset, predicate)
+        if pushed is None:
+            pushed = _time_bitmap(dataset, predicate)
+        if pushed is None:
+            residual.append(predicate)
+        else:
+            bitmap = pushed if bitmap is None else bitmap & pushed
+    rows = range(dataset.row_count()) if bitmap is None else bitmap_rows(bitmap)
+    for predicate in residual:
+        rows = _residual_filter(dataset, rows, predicate)
+    return list(rows)
+
+
+def _execute(dataset, rows, group_keys, aggregates) -> dict:
+    """Computes every aggregate for every group in one pass over the rows."""
+    key_columns = [column_values(dataset, key) for key in group_keys]
+    value_columns = {
+        column: column_values(dataset, column)
+        for _, column in aggregates
+        if column is not None
+    }
+    groups = {}
+    for row in rows:
+        key = tuple(column[row] for column in key_columns)
+        state = groups.get(key)
+        if state is None:
+            state = groups[key] = {"count": 0}
+            for column in value_columns:
+                state[column] = [0, None, None]  # sum, min, max
+        state["count"] += 1
+        for column, values in value_columns.items():
+            value = values[row]
+            totals = state[column]
+            totals[0] += value
+            if totals[1] is None or value < totals[1]:
+                totals[1] = value
+            if totals[2] is None or value > totals[2]:
+                totals[2] = value
+    if not group_keys and not groups:  # empty selection still has a count
+        groups[()] = {"count": 0}
+        for column in value_columns:
+            groups[()][column] = [0, None, None]
+    results = {}
+    for key, state in sorted(groups.items()):
+        result = {}
+        for function, column in aggregates:
+            if function == "count":
+                value = state["count"]
+            else:
+                total, smallest, largest = state[column]
+                value = {
+                    "sum": total,
+                    "mean": total / state["count"] if state["count"] else None,
+                    "min": smallest,
+                    "max": largest,
+                }[function]
+            result[aggregate_name(function, column)] = value
+        results[key[0] if len(key) == 1 else key] = result
+    return results[()] if not group_keys else results
+
+
+def run_queries(dataset, queries: list) -> list:
+    """
+    Runs many queries over the same dataset. Queries with the same predicates
+    share one filter, and queries that also share a grouping are answered by
+    a single pass that computes all of their aggregates together.
+    """
+    filtered, plans = {}, {}
+    for query_ in queries:
+        key = (frozenset(query_.predicates), query_.group_keys)
+        aggregates = plans.setdefault(key, [])
+        for aggregate in query_.aggregates or (("count", None),):
+            if aggregate not in aggregates:
+                aggregates.append(aggregate)
+    answers = {}
+    for (predicates, group_keys), aggregates in plans.items():
+        if predicates not in filtered:
+            filtered[predicates] = filter_rows(dataset, predicates)
+        answers[predicates, group_keys] = _execute(
+            dataset, filtered[predicates], group_keys, aggregates
+        )
+    results = []
+    for query_ in queries:
+        answer = answers[frozenset(query_.predicates), query_.group_keys]
+        names = [
+            aggregate_name(function, column)
+            for function, column in query_.aggregates or (("count", None),)
+        ]
+        if query_.group_keys:
+            results.append(
+                {
+                    group: {name: values[name] for name in names}
+                    for group, values in answer.items()
+                }
+            )
+        else:
+            results.append({name: answer[name] for name in names})
+    return results
@@ -0,0 +1,287 @@
+# Author: B.G Ranuga Gamage
+# Date: 3/12/2024
+# Student ID: 20231264
+
+import argparse
+import contextlib
+import os
+from xml.sax.saxutils import escape
+
+from graphics import GraphicsError, Point, Rectangle, Text
+
+try:  # Pillow is only needed for PNG output
+    from PIL import Image, ImageDraw, ImageFont
+except ImportError:
+    Image = None
+
+POINTS_TO_PIXELS = 96 / 72  # Tk font sizes are in points
+HISTOGRAM_WIDTH = 1080 + 440
+HISTOGRAM_HEIGHT = 848
+
+
+class HeadlessWin:
+    def __init__(self, title="Graphics Window", width=200, height=200):
+        """
+        A stand-in for GraphWin that records the canvas items the graphics
+        objects create instead of drawing them with Tk, and writes them to an
+        SVG or PNG file. It supports the calls HistogramApp makes.
+        """
+        self.title = title
+        self.width = width
+        self.height = height
+        self.background = "white"
+        self.items = {}  # id -> [kind, screen coords, options], in drawing order
+        self.next_id = 1
+        self.trans = None
+        self.autoflush = False  # graphics objects never call Tk's update
+        self.closed = False
+
+    # window and coordinates, as in GraphWin
+    def setCoords(self, x1, y1, x2, y2):
+        w, h = self.width - 1, self.height - 1
+        self.trans = (x1, y2, (x2 - x1) / float(w), (y2 - y1) / float(h))
+
+    def toScreen(self, x, y):
+        if self.trans is None:
+            return x, y
+        xbase, ybase, xscale, yscale = self.trans
+        return int((x - xbase) / xscale + 0.5), int((ybase - y) / yscale + 0.5)
+
+    def setBackground(self, color):
+        self.background = color
+
+    def isClosed(self):
+        return self.closed
+
+    def isOpen(self):
+        return not self.closed
+
+    def close(self):
+        self.closed = True
+
+    def getMouse(self):
+        return None  # nobody to click, carry on
+
+    def flush(self):
+        pass
+
+    def update_idletasks(self):
+        pass
+
+    def beginBatch(self):
+        pass
+
+    def commitBatch(self):
+        pass
+
+    def batch(self):
+        return contextlib.nullcontext(self)
+
+    # the Tk canvas methods used by the graphics objects
+    def _add(self, kind, coords, options):
+        item_id = self.next_id
+        self.next_id += 1
+        self.items[item_id] = [kind, list(coords), dict(options)]
+        return item_id
+
+    def create_rectangle(self, x1, y1, x2, y2, options):
+        return self._add("rectangle", (x1, y1, x2, y2), options)
+
+    def create_text(self, x, y, options):
+        return self._add("text", (x, y), options)
+
+    def coords(self, item_id, *coords):
+        self.items[item_id][1] = list(coords)
+
+    def itemconfig(self, item_id, options=None, **changes):
+        self.items[item_id][2].update(options or {}, **changes)
+
+    def delete(self, item_id):
+        self.items.pop(item_id, None)
+
+    def move(self, item_id, dx, dy):
+        item = self.items[item_id]
+        item[1] = [value + (dx, dy)[idx % 2] for idx, value in enumerate(item[1])]
+
+    # bulk creation, as in GraphWin
+    def drawRectangles(self, coords, fill="", outline="black", width=1):
+        coords = list(coords)
+        fills = [fill] * len(coords) if isinstance(fill, str) else list(fill)
+        edges = [outline] * len(coords) if isinstance(outline, str) else list(outline)
+        rects = []
+        for (x1, y1, x2, y2), color, edge in zip(coords, fills, edges):
+            rect = Rectangle(Point(x1, y1), Point(x2, y2))
+            rect.config.update(fill=color, outline=edge, width=str(width))
+            rect.draw(self)
+            rects.append(rect)
+        return rects
+
+    def drawTexts(
+        self, points, texts, size=12, style="normal", face="helvetica", fill="black"
+    ):
+        points, texts = list(points), list(texts)
+        if len(points) != len(texts):
+            raise GraphicsError("points and texts differ in length")
+        fills = [fill] * len(points) if isinstance(fill, str) else list(fill)
+        labels = []
+        for (x, y), text, color in zip(points, texts, fills):
+            label = Text(Point(x, y), text)
+            label.config.update(fill=color, font=(face, size, style))
+            label.draw(self)
+            labels.append(label)
+        return labels
+
+    # output
+    def to_svg(self) -> str:
+        parts = [
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{self.width}" '
+            f'height="{self.height}" viewBox="0 0 {self.width} {self.height}">',
+            f"<title>{escape(self.title)}</title>",
+            f'<rect width="100%" height="100%" fill="{self.background}"/>',
+        ]
+        for kind, coords, options in self.items.values():
+            if kind == "rectangle":
+                x1, y1, x2, y2 = coords
+                parts.append(
+                    f'<rect x="{min(x1, x2)}" y="{min(y1, y2)}" '
+                    f'width="{abs(x2 - x1)}" height="{abs(y2 - y1)}" '
+                    f'fill="{options.get("fill") or "none"}" '
+                    f'stroke="{options.get("outline") or "none"}" '
+                    f'stroke-width="{options.get("width", 1)}"/>'
+                )
+            else:
+                x, y = coords
+                face, size, style = options["font"]
+                parts.append(
+                    f'<text x="{x}" y="{y}" font-family="{face}" '
+                    f'font-size="{size}pt" font-weight='
+                    f'"{"bold" if "bold" in style else "normal"}" font-style='
+                    f'"{"italic" if "italic" in style else "normal"}" '
+                    f'fill="{options.get("fill") or "black"}" text-anchor="middle" '
+                    f'dominant-baseline="central">{escape(options["text"])}</text>'
+                )
+        parts.append("</svg>")
+        return "\n".join(parts)
+
+    def save_svg(self, path: str):
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(self.to_svg())
+
+    def save_png(self, path: str):
+        if Image is None:
+            raise GraphicsError("PNG output needs Pillow (pip install pillow)")
+        image = Image.new("RGB", (self.width, self.height), self.background)
+        draw = ImageDraw.Draw(image)
+        fonts = {}
+        for kind, coords, options in self.items.values():
+            if kind == "rectangle":
+                x1, y1, x2, y2 = coords
+                draw.rectangle(
+                    (min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2)),
+                    fill=options.get("fill") or None,
+                    outline=options.get("outline") or None,
+                    width=int(options.get("width", 1)),
+                )
+            else:
+                size = round(options["font"][1] * POINTS_TO_PIXELS)
+                if size not in fonts:
+                    fonts[size] = ImageFont.load_default(size)
+                draw.text(
+                    coords,
+                    options["text"],
+                    fill=options.get("fill") or "black",
+                    font=fonts[size],
+                    anchor="mm",
+                )
+        image.save(path)
+
+    def save(self, path: str):
+        """Writes the drawing as PNG when path ends in .png, otherwise as SVG."""
+        if path.lower().endswith(".png"):
+            self.save_png(path)
+        else:
+            self.save_svg(path)
+
+
+def render_histogram(traffic_data: dict, date: str, path: str) -> str:
+    """
+    Draws the HistogramApp chart of traffic_data ({"HH": {junction: count}})
+    into an image file without opening a window.
+    """
+    from w2120198_de import HistogramApp
+
+    win = HeadlessWin("Vehicle Frequency Histogram", HISTOGRAM_WIDTH, HISTOGRAM_HEIGHT)
+    app = HistogramApp(traffic_data, date, win)
+    app.setup_window()
+    app.draw_histogram()
+    app.add_legend()
+    win.save(path)
+    return path
+
+
+def render_file(task: tuple) -> str:
+    """Renders the histogram of one (date, file path, image path) task."""
+    from w2120198_de import MultiCSVProcessor
+
+    date, file_path, path = task
+    processor = MultiCSVProcessor()
+    processor.load_csv_file(file_path)
+    return render_histogram(processor.current_data, f"{date:%d/%m/%Y}", path)
+
+
+def render_files(
+    files: list, output: str = "./", image_format: str = "svg", workers: int = None
+) -> list:
+    """
+    Renders histogram_DDMMYYYY.<format> for every (date, file path) pair in
+    files, on a process pool when there is more than one file.
+    """
+    os.makedirs(output, exist_ok=True)
+    tasks = [
+        (
+            date,
+            file_path,
+            os.path.join(output, f"histogram_{date:%d%m%Y}.{image_format}"),
+        )
+        for date, file_path in files
+    ]
+    if workers == 1 or len(tasks) < 2:
+        return list(map(render_file, tasks))
+    from concurrent.futures import ProcessPoolExecutor  # loaded only for a pool
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(render_file, tasks))
+
+
+def main(argv=None):
+    """
+    Command line entry point, for example:
+    python traffic_render.py --from 01/06/2024 --to 30/06/2024 --output charts
+    """
+    from traffic_batch import collect_files, parse_date
+
+    parser = argparse.ArgumentParser(description="Render histograms without Tk.")
+    parser.add_argument("dates", nargs="*", type=parse_date, help="DD/MM/YYYY")
+    parser.add_argument("--from", dest="start", type=parse_date)
+    parser.add_argument("--to", dest="end", type=parse_date)
+    parser.add_argument("--glob", dest="patterns", action="append", default=[])
+    parser.add_argument("--directory", default="./")
+    parser.add_argument("--output", default="./")
+    parser.add_argument(
+        "--format", dest="image_format", choices=("svg", "png"), default="svg"
+    )
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+    if args.end is not None and args.start is None:
+        parser.error("--to needs --from")
+    files = collect_files(
+        args.dates, args.start, args.end, args.patterns, args.directory
+    )
+    if not files:
+        parser.error("no traffic data files matched")
+    for path in render_files(files, args.output, args.image_format, args.workers):
+        print(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# Author: B.G Ranuga Gamage
+# Date: 3/12/2024
+# Student ID: 20231264
+
+import datetime
+import json
+import os
+
+RESULTS_LOG = "results.jsonl"
+
+
+class ResultsStore:
+    def __init__(self, path: str = RESULTS_LOG):
+        """
+        Append-only log of analysed dates, one JSON record per line, with a
+        side index (<path>.idx) of "date offset" lines so a past day can be read
+        back with a single seek.
+        """
+        self.path = path
+        self.index_path = f"{path}.idx"
+        self._offsets = None  # date -> byte offset of its latest record
+
+    def append(self, date: datetime.date, file_path: str, outcomes: dict) -> int:
+        """Appends the outcomes of a date and returns the offset of the record."""
+        record = {
+            "date": date.isoformat(),
+            "file": os.path.basename(file_path),
+            "saved_at": datetime.datetime.now().isoformat(timespec="seconds"),
+            "outcomes": outcomes,
+        }
+        line = json.dumps(record, ensure_ascii=False).encode() + b"\n"
+        with open(self.path, "ab") as file:
+            offset = file.seek(0, os.SEEK_END)
+            file.write(line)
+        with open(self.index_path, "a", encoding="utf-8") as index:
+            index.write(f"{date.isoformat()} {offset}\n")
+        if self._offsets is not None:
+            self._offsets[date] = offset
+        return offset
+
+    def _index(self) -> dict:
+        if self._offsets is None:
+            self._offsets = {}
+            try:
+                with open(self.index_path, encoding="utf-8") as index:
+                    for line in index:
+                        date, _, offset = line.strip().partition(" ")
+                        if offset:  # skip a torn last line
+                            self._offsets[datetime.date.fromisoformat(date)] = int(
+                                offset
+                            )
+            except FileNotFoundError:
+                pass
+        return self._offsets
+
+    def get(self, date: datetime.date):
+        """Returns the latest record saved for a date, or None."""
+        offset = self._index().get(date)
+        if offset is None:
+            return None
+        with open(self.path, "rb") as file:
+            file.seek(offset)
+            return json.loads(file.readline())
+
+    def dates(self) -> list:
+        """Returns every date that has a saved record, in order."""
+        return sorted(self._index())
+
+
+def main(argv=None):
+    """
+    Prints the saved outcomes of past dates, for example:
+    python traffic_results.py 15/06/2024
+    """
+    import argparse
+
+    # imported here to avoid a circular import through w2120198_abc
+    from traffic_batch import parse_date
+
+    parser = argparse.ArgumentParser(description="Show saved traffic outcomes.")
+    parser.add_argument("dates", nargs="*", type=parse_date, help="DD/MM/YYYY")
+    parser.add_argument("--log", default=RESULTS_LOG)
+    args = parser.parse_args(argv)
+    store = ResultsStore(args.log)
+    if not args.dates:
+        for date in store.dates():
+            print(f"{date:%d/%m/%Y}")
+        return
+    for date in args.dates:
+        record = store.get(date)
+        if record is None:
+            print(f"No saved results for {date:%d/%m/%Y}")
+            continue
+        print(
+            f"Results for {date:%d/%m/%Y} ({record['file']}, saved {record['saved_at']})"
+        )
+        for outcome, value in record["outcomes"].items():
+            print(f"{outcome}: {value}")
+
+
+if __name__ == "__main__":
+    main()
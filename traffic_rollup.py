@@ -0,0 +1,233 @@
+# Author: B.G Ranuga Gamage
+# Date: 3/12/2024
+# Student ID: 20231264
+
+import argparse
+import calendar
+import datetime
+import json
+import os
+
+from traffic_batch import collect_files, parse_date
+from traffic_cache import load_cached_dataset
+from traffic_engine import find_peak_traffic_hour
+from w2120198_abc import display_outcomes, get_catalog, load_csv_file
+
+CUBE_DIR = ".cubes"
+CUBE_COLUMNS = ("JunctionName", "timeOfDay", "VehicleType")  # all a cube needs
+
+
+class DayCube:
+    def __init__(self, date: datetime.date, counts: dict):
+        """
+        Pre-aggregated vehicle counts for one survey day, stored as
+        counts[junction][vehicle type] = [count for hour 0, ..., hour 23].
+        """
+        self.date = date
+        self.counts = counts
+
+    @classmethod
+    def from_dataset(cls, date: datetime.date, dataset) -> "DayCube":
+        """Builds the cube in one pass over the junction, hour and type columns."""
+        junctions = dataset["JunctionName"]
+        types = dataset["VehicleType"]
+        cells = {}
+        for junction_code, seconds, type_code in zip(
+            junctions.codes, dataset["timeOfDay"].seconds, types.codes
+        ):
+            key = (junction_code, type_code)
+            hours = cells.get(key)
+            if hours is None:
+                hours = cells[key] = [0] * 24
+            hours[seconds // 3600] += 1
+        counts = {}
+        for (junction_code, type_code), hours in sorted(cells.items()):
+            junction = junctions.values[junction_code]
+            counts.setdefault(junction, {})[types.values[type_code]] = hours
+        return cls(date, counts)
+
+    def total(self) -> int:
+        return sum(
+            sum(hours) for types in self.counts.values() for hours in types.values()
+        )
+
+    def to_json(self) -> dict:
+        return {"date": self.date.isoformat(), "counts": self.counts}
+
+    @classmethod
+    def from_json(cls, value: dict) -> "DayCube":
+        return cls(datetime.date.fromisoformat(value["date"]), value["counts"])
+
+
+def cube_path(file_path: str, date: datetime.date) -> str:
+    """Cubes are stored in a .cubes directory next to the data files."""
+    directory = os.path.join(os.path.dirname(file_path), CUBE_DIR)
+    return os.path.join(directory, f"{date:%d%m%Y}.json")
+
+
+def load_day_cube(date: datetime.date, file_path: str) -> DayCube:
+    """
+    Returns the cube of a day, reading the stored aggregate when it was built
+    from the same version of the CSV file, and building it otherwise.
+    """
+    stat = os.stat(file_path)
+    source = [stat.st_size, stat.st_mtime_ns]
+    path = cube_path(file_path, date)
+    try:
+        with open(path, encoding="utf-8") as file:
+            stored = json.load(file)
+        if stored["source"] == source:
+            return DayCube.from_json(stored)
+    except (OSError, ValueError, KeyError):
+        pass
+    dataset = load_cached_dataset(file_path, load_csv_file, CUBE_COLUMNS)
+    cube = DayCube.from_dataset(date, dataset)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump({**cube.to_json(), "source": source}, file)
+    except OSError:
+        pass
+    return cube
+
+
+class RangeRollup:
+    def __init__(self, start: datetime.date, end: datetime.date, cubes: list):
+        """
+        Sums the day cubes of a date range. Only the small cubes are read, the
+        raw CSV files are loaded once per day the first time they are rolled up.
+        """
+        self.start = start
+        self.end = end
+        self.cubes = cubes
+        self.counts = {}
+        for cube in cubes:
+            for junction, types in cube.counts.items():
+                target = self.counts.setdefault(junction, {})
+                for vehicle_type, hours in types.items():
+                    totals = target.setdefault(vehicle_type, [0] * 24)
+                    for hour, count in enumerate(hours):
+                        totals[hour] += count
+
+    def hour_totals(self) -> dict:
+        totals = {hour: 0 for hour in range(24)}
+        for types in self.counts.values():
+            for hours in types.values():
+                for hour, count in enumerate(hours):
+                    totals[hour] += count
+        return totals
+
+    def junction_totals(self) -> dict:
+        return {
+            junction: sum(sum(hours) for hours in types.values())
+            for junction, types in self.counts.items()
+        }
+
+    def type_totals(self) -> dict:
+        totals = {}
+        for types in self.counts.values():
+            for vehicle_type, hours in types.items():
+                totals[vehicle_type] = totals.get(vehicle_type, 0) + sum(hours)
+        return dict(sorted(totals.items()))
+
+    def hourly_junction_counts(self) -> dict:
+        """Returns {"HH": {junction: count}}, the format HistogramApp draws."""
+        return {
+            f"{hour:02d}": {
+                junction: sum(hours[hour] for hours in types.values())
+                for junction, types in self.counts.items()
+            }
+            for hour in range(24)
+        }
+
+    def report(self) -> dict:
+        """Builds the outcome dictionary of the date range."""
+        outcomes = {}
+        outcomes["The date range of the report"] = (
+            f"{self.start:%d/%m/%Y} to {self.end:%d/%m/%Y}"
+        )
+        outcomes["The number of survey days found in the range"] = len(self.cubes)
+        total = sum(cube.total() for cube in self.cubes)
+        outcomes["The total number of vehicles for the date range"] = total
+        if not self.cubes:
+            return outcomes
+        outcomes[
+            "The average number of vehicles per survey day (rounded to an integer)"
+        ] = round(total / len(self.cubes))
+        for junction, count in self.junction_totals().items():
+            outcomes[f"The total number of vehicles through {junction}"] = count
+        for vehicle_type, count in self.type_totals().items():
+            outcomes[f"The total number of vehicles of type {vehicle_type}"] = count
+        busiest = max(self.cubes, key=DayCube.total)
+        outcomes["The busiest day in the date range"] = (
+            f"{busiest.date:%d/%m/%Y} ({busiest.total()} vehicles)"
+        )
+        outcomes["The peak hour for traffic across the date range"] = (
+            find_peak_traffic_hour(self.hour_totals())
+        )
+        return outcomes
+
+
+def rollup(start: datetime.date, end: datetime.date, directory=None) -> RangeRollup:
+    """
+    Rolls up every survey day with a data file between start and end, in the
+    given directory or in the configured data directories.
+    """
+    if directory is None:
+        files = [
+            (date, entry["path"]) for date, entry in get_catalog().between(start, end)
+        ]
+    else:
+        files = collect_files(start=start, end=end, directory=directory, verbose=False)
+    return RangeRollup(
+        start, end, [load_day_cube(date, file_path) for date, file_path in files]
+    )
+
+
+def week_range(date: datetime.date) -> tuple:
+    """Returns the Monday and Sunday of the week containing date."""
+    monday = date - datetime.timedelta(days=date.weekday())
+    return monday, monday + datetime.timedelta(days=6)
+
+
+def month_range(year: int, month: int) -> tuple:
+    return (
+        datetime.date(year, month, 1),
+        datetime.date(year, month, calendar.monthrange(year, month)[1]),
+    )
+
+
+def parse_month(text: str) -> tuple:
+    """Parses MM/YYYY into (year, month)."""
+    try:
+        month, year = map(int, text.replace("-", "/").split("/"))
+        datetime.date(year, month, 1)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid month: {text!r}")
+    return year, month
+
+
+def main(argv=None):
+    """
+    Command line entry point, for example:
+    python traffic_rollup.py --month 06/2024
+    """
+    parser = argparse.ArgumentParser(description="Date range traffic reports.")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--month", type=parse_month, help="MM/YYYY")
+    group.add_argument("--week", type=parse_date, help="any day of the week")
+    group.add_argument("--from", dest="start", type=parse_date)
+    parser.add_argument("--to", dest="end", type=parse_date)
+    parser.add_argument("--directory", help="defaults to the data directories")
+    args = parser.parse_args(argv)
+    if args.month:
+        start, end = month_range(*args.month)
+    elif args.week:
+        start, end = week_range(args.week)
+    else:
+        start, end = args.start, args.end or args.start
+    display_outcomes(rollup(start, end, args.directory).report())
+
+
+if __name__ == "__main__":
+    main()
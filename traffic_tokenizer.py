@@ -0,0 +1,109 @@
+# Author: B.G Ranuga Gamage
+# Date: 3/12/2024
+# Student ID: 20231264
+
+import csv
+from itertools import chain, islice, repeat
+
+from traffic_dataset import TrafficDataset
+
+CHUNK_ROWS = 1 << 12  # lines tokenised and converted per batch
+QUOTE = b'"'
+
+
+def split_header(line: bytes) -> list:
+    """Returns the column names of a raw header line, quoted or not."""
+    text = line.decode().strip()
+    if '"' in text:
+        return next(csv.reader([text]), [])
+    return text.split(",")
+
+
+def column_positions(header: list, columns=None) -> list:
+    """Returns the positions of the requested columns in file order (all by default)."""
+    if columns is None:
+        return list(range(len(header)))
+    missing = [name for name in columns if name not in header]
+    if missing:
+        raise ValueError(f"no column(s) {', '.join(missing)}")
+    return sorted({header.index(name) for name in columns})
+
+
+def _schema_lines(chunk: list, width: int, first_row: int) -> list:
+    """Drops blank lines and rejects lines that do not have `width` fields."""
+    kept = []
+    for number, line in enumerate(chunk, first_row):
+        if line.count(b",") == width - 1:
+            kept.append(line)
+        elif line.strip():
+            raise ValueError(f"row {number} does not have the {width} header fields")
+    return kept
+
+
+def split_columns(chunk: list, positions: list, width: int, first_row: int = 1):
+    """
+    Splits a batch of raw lines into one list of bytes fields per kept column.
+    The lines are joined with b"," and split once, so every column is a
+    strided slice of the fields and no per-line lists are built.
+    """
+    if set(map(bytes.count, chunk, repeat(b","))) != {width - 1}:  # strict schema
+        chunk = _schema_lines(chunk, width, first_row)
+    fields = b",".join(chunk).split(b",") if chunk else []
+    columns = [fields[position::width] for position in positions]
+    for idx, position in enumerate(positions):
+        if position == 0:  # a line may start with white space
+            columns[idx] = list(map(bytes.lstrip, columns[idx]))
+        if position == width - 1:  # and ends with its line ending
+            columns[idx] = list(map(bytes.rstrip, columns[idx]))
+    return columns
+
+
+def _read_quoted(dataset, lines, positions, width, first_row):
+    """The csv module fallback for quoted fields, embedded commas and newlines."""
+    reader = csv.reader(line.decode() for line in lines)
+    for number, record in enumerate(reader, first_row):
+        if not record:  # blank line
+            continue
+        if len(record) != width:
+            raise ValueError(f"row {number} does not have the {width} header fields")
+        dataset.append_row([record[position] for position in positions])
+    return dataset
+
+
+def read_rows(dataset: TrafficDataset, lines, positions: list, width: int):
+    """
+    Appends raw bytes lines of a file with `width` columns to the dataset,
+    keeping the fields at `positions`. The fields reach the typed columns as
+    bytes, so no str is made for numbers, flags or repeated values. A batch
+    containing a quote switches the rest of the input to the csv module.
+    """
+    lines = iter(lines)
+    row = 1
+    for chunk in iter(lambda: list(islice(lines, CHUNK_ROWS)), []):
+        if QUOTE in b"".join(chunk):
+            return _read_quoted(dataset, chain(chunk, lines), positions, width, row)
+        dataset.extend_bytes(split_columns(chunk, positions, width, row))
+        row += len(chunk)
+    return dataset
+
+
+def parse_bytes(buffer: bytes, header: list, columns=None) -> TrafficDataset:
+    """Parses a buffer of raw rows (no header line) of a file with this header."""
+    positions = column_positions(header, columns)
+    dataset = TrafficDataset([header[position] for position in positions])
+    return read_rows(dataset, buffer.splitlines(True), positions, len(header))
+
+
+def load_csv(file_path: str, columns=None) -> TrafficDataset:
+    """
+    Loads a traffic data file, or only the given columns of it. The fields
+    of the other columns are split off but never converted or stored.
+    """
+    with open(file_path, "rb") as file:
+        header = split_header(file.readline())
+        try:
+            positions = column_positions(header, columns)
+        except ValueError as error:
+            raise ValueError(f"{file_path} has {error}") from None
+        dataset = TrafficDataset([header[position] for position in positions])
+        return read_rows(dataset, file, positions, len(header))
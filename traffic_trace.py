@@ -0,0 +1,259 @@
+# Author: B.G Ranuga Gamage
+# Date: 3/12/2024
+# Student ID: 20231264
+
+import atexit
+import os
+import _thread  # threading.get_ident without importing threading
+import time
+
+TRACE_VARIABLE = "TRAFFIC_TRACE"  # set to a .json path to trace a whole run
+TRACE_PID_VARIABLE = "TRAFFIC_TRACE_PID"  # the traced process, set on first import
+TRACE_ORIGIN_VARIABLE = "TRAFFIC_TRACE_ORIGIN"  # its start, in wall clock ns
+
+
+class _NullSpan:
+    """Shared do-nothing span returned while tracing is disabled."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    def __init__(self, tracer, name, category, args):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        end = time.perf_counter_ns()
+        self.tracer.events.append(
+            (
+                self.name,
+                self.category,
+                self.start,
+                end - self.start,
+                os.getpid(),
+                _thread.get_ident(),
+                self.args,
+            )
+        )
+        return False
+
+
+class Tracer:
+    def __init__(self):
+        """
+        Collects (name, category, start, duration, pid, tid, args) span events.
+        Nothing is recorded until enable() is called.
+        """
+        self.enabled = False
+        self.events = []
+        # starts are perf_counter_ns values, the offset turns them into wall
+        # clock ns so events of several processes share one absolute origin
+        self.clock_offset = time.time_ns() - time.perf_counter_ns()
+        self.origin = time.time_ns()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def clear(self):
+        self.events = []
+
+    def span(self, name: str, category: str = "stage", **args):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, category, args)
+
+    def chrome_trace(self) -> dict:
+        """Returns the events in the Chrome trace-event format (complete events)."""
+        return {
+            "traceEvents": [
+                {
+                    "name": name,
+                    "cat": category,
+                    "ph": "X",
+                    "ts": (start + self.clock_offset - self.origin) / 1000,
+                    "dur": duration / 1000,
+                    "pid": pid,
+                    "tid": tid,
+                    "args": args,
+                }
+                for name, category, start, duration, pid, tid, args in self.events
+            ],
+            "displayTimeUnit": "ms",
+        }
+
+    def add_chrome_events(self, events: list):
+        """Adds the complete events of a chrome_trace() with the same origin."""
+        for event in events:
+            self.events.append(
+                (
+                    event["name"],
+                    event["cat"],
+                    round(event["ts"] * 1000) + self.origin - self.clock_offset,
+                    round(event["dur"] * 1000),
+                    event["pid"],
+                    event["tid"],
+                    event["args"],
+                )
+            )
+
+    def export_chrome_trace(self, path: str):
+        """Writes a file that chrome://tracing or Perfetto can open."""
+        import json  # only needed when a trace is written
+
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.chrome_trace(), file)
+
+    def summary(self) -> dict:
+        """Returns {name: {"count", "total_ms", "mean_ms", "max_ms"}}."""
+        summary = {}
+        for name, _, _, duration, _, _, _ in self.events:
+            stats = summary.setdefault(
+                name, {"count": 0, "total_ms": 0.0, "max_ms": 0.0}
+            )
+            stats["count"] += 1
+            stats["total_ms"] += duration / 1e6
+            stats["max_ms"] = max(stats["max_ms"], duration / 1e6)
+        for stats in summary.values():
+            stats["mean_ms"] = stats["total_ms"] / stats["count"]
+        return dict(sorted(summary.items(), key=lambda item: -item[1]["total_ms"]))
+
+    def summary_table(self) -> str:
+        lines = [
+            f"{'span':<50}{'count':>8}{'total ms':>12}{'mean ms':>12}{'max ms':>12}"
+        ]
+        for name, stats in self.summary().items():
+            lines.append(
+                f"{name[:49]:<50}{stats['count']:>8}{stats['total_ms']:>12.3f}"
+                f"{stats['mean_ms']:>12.3f}{stats['max_ms']:>12.3f}"
+            )
+        return "\n".join(lines)
+
+
+TRACER = Tracer()
+
+
+def span(name: str, category: str = "stage", **args):
+    """
+    Times a block when tracing is enabled:
+        with span("load_csv_file", file=file_path): ...
+    """
+    if not TRACER.enabled:
+        return _NULL_SPAN
+    return _Span(TRACER, name, category, args)
+
+
+def traced(name: str = None, category: str = "stage"):
+    """Decorator that records a span around every call of the function."""
+
+    def decorator(function):
+        span_name = name or function.__qualname__
+
+        def wrapper(*args, **kwargs):
+            if not TRACER.enabled:
+                return function(*args, **kwargs)
+            with _Span(TRACER, span_name, category, {}):
+                return function(*args, **kwargs)
+
+        # what functools.wraps copies, without importing functools at startup
+        for attribute in ("__module__", "__name__", "__qualname__", "__doc__"):
+            setattr(wrapper, attribute, getattr(function, attribute))
+        wrapper.__dict__.update(function.__dict__)
+        wrapper.__wrapped__ = function
+        return wrapper
+
+    return decorator
+
+
+def enable_tracing():
+    TRACER.enable()
+
+
+def _worker_files(path: str) -> list:
+    """Returns the <path>.<pid> files written by the pool workers of a run."""
+    directory, name = os.path.split(os.path.abspath(path))
+    return [
+        os.path.join(directory, item)
+        for item in os.listdir(directory)
+        if item.startswith(f"{name}.") and item[len(name) + 1 :].isdigit()
+    ]
+
+
+def _merge_worker_files(path: str):
+    """Moves the spans of the worker files into TRACER and deletes the files."""
+    import json
+
+    for worker_path in _worker_files(path):
+        try:
+            with open(worker_path, encoding="utf-8") as file:
+                TRACER.add_chrome_events(json.load(file)["traceEvents"])
+            os.remove(worker_path)
+        except (OSError, ValueError, KeyError):
+            pass
+    TRACER.events.sort(key=lambda event: event[2])
+
+
+def _export(path: str):
+    if os.getpid() != _main_pid():  # pool workers write their own file
+        if TRACER.events:
+            TRACER.export_chrome_trace(f"{path}.{os.getpid()}")
+        return
+    _merge_worker_files(path)  # the workers have exited by now
+    TRACER.export_chrome_trace(path)
+    print(TRACER.summary_table())
+    print(f"Trace written to {path}")
+
+
+def _main_pid() -> int:
+    return int(os.environ.get(TRACE_PID_VARIABLE, os.getpid()))
+
+
+def _start_worker_trace(tracer):
+    """
+    Pool workers leave through os._exit, so atexit never runs in them, but
+    multiprocessing runs its finalizers before that. Events inherited from a
+    forked parent are dropped, the parent exports those itself.
+    """
+    from multiprocessing import util
+
+    tracer.clear()
+    util.Finalize(None, _export, args=(os.environ[TRACE_VARIABLE],), exitpriority=0)
+
+
+if os.environ.get(TRACE_VARIABLE):  # e.g. TRAFFIC_TRACE=trace.json python ...
+    from multiprocessing import util
+
+    TRACER.enable()
+    # children, forked or spawned, inherit the pid of the process that owns the
+    # trace and its origin, so their spans line up with the parent's
+    os.environ.setdefault(TRACE_PID_VARIABLE, str(os.getpid()))
+    os.environ.setdefault(TRACE_ORIGIN_VARIABLE, str(TRACER.origin))
+    TRACER.origin = int(os.environ[TRACE_ORIGIN_VARIABLE])
+    if os.getpid() == _main_pid():
+        for stale in _worker_files(os.environ[TRACE_VARIABLE]):  # earlier runs
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+        atexit.register(_export, os.environ[TRACE_VARIABLE])
+    else:  # imported in a worker that is already running
+        _start_worker_trace(TRACER)
+    # multiprocessing calls this in every worker it starts after this import,
+    # once it has reset the finalizers the worker inherited
+    util.register_after_fork(TRACER, _start_worker_trace)
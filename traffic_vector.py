@@ -0,0 +1,166 @@
+# Author: B.G Ranuga Gamage
+# Date: 3/12/2024
+# Student ID: 20231264
+
+import os
+
+from traffic_engine import (
+    ELM_AVENUE,
+    HANLEY_HIGHWAY,
+    RAIN_CONDITIONS,
+    TWO_WHEELED_TYPES,
+    OutcomeAccumulator,
+)
+
+BACKEND_VARIABLE = "TRAFFIC_BACKEND"  # "numpy", "python" or "auto" (default)
+BACKENDS = ("auto", "numpy", "python")
+_numpy = None  # the numpy module once imported, False when it is not installed
+
+
+def get_numpy():
+    """Imports NumPy on first use and returns it, or None when it is not installed."""
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+        except ImportError:
+            numpy = False
+        _numpy = numpy
+    return _numpy or None
+
+
+def select_backend(name: str = None) -> str:
+    """
+    Returns "numpy" or "python" for the requested backend (or the
+    TRAFFIC_BACKEND environment variable). "auto" picks NumPy when it is installed.
+    """
+    name = (name or os.environ.get(BACKEND_VARIABLE) or "auto").lower()
+    if name not in BACKENDS:
+        raise ValueError(f"unknown backend {name!r}, expected one of {BACKENDS}")
+    if name == "python":
+        return name
+    if get_numpy() is None:
+        if name == "numpy":
+            raise ImportError("the numpy backend needs NumPy (pip install numpy)")
+        return "python"
+    return "numpy"
+
+
+def as_array(buffer):
+    """Zero-copy NumPy view of an array.array or a memoryview column buffer."""
+    np = get_numpy()
+    return np.frombuffer(
+        buffer, dtype=getattr(buffer, "typecode", None) or buffer.format
+    )
+
+
+def _is_any(column, codes, values):
+    """Boolean mask of the rows of a category column equal to any of the values."""
+    np = get_numpy()
+    wanted = [column.code_of(value) for value in values]
+    wanted = [code for code in wanted if code is not None]
+    if not wanted:
+        return np.zeros(len(codes), dtype=bool)
+    if len(wanted) == 1:
+        return codes == wanted[0]
+    table = np.zeros(len(column.values), dtype=bool)  # code -> wanted
+    table[wanted] = True
+    return table[codes]
+
+
+def _bits(column):
+    """Unpacks a BitColumn into one bool per row."""
+    np = get_numpy()
+    packed = np.frombuffer(column.bits, dtype=np.uint8)
+    bits = np.unpackbits(packed, count=column.length, bitorder="little")
+    return bits.astype(bool)
+
+
+def ordered_hour_count(hours) -> dict:
+    """
+    Counts an array of hours with np.unique and returns {hour: count} in the
+    order the hours first appear, like the pure Python dictionaries.
+    """
+    np = get_numpy()
+    if len(hours) == 0:
+        return {}
+    values, first, counts = np.unique(hours, return_index=True, return_counts=True)
+    order = np.argsort(first)  # the row each hour is first seen in
+    return {int(hour): int(count) for hour, count in zip(values[order], counts[order])}
+
+
+def numpy_accumulator(dataset) -> OutcomeAccumulator:
+    """
+    Fills an OutcomeAccumulator for a TrafficDataset with vectorised masks over
+    the typed columns instead of a loop over the rows.
+    """
+    np = get_numpy()
+    junction = dataset["JunctionName"]
+    vehicle_type = dataset["VehicleType"]
+    direction_in = dataset["travel_Direction_in"]
+    direction_out = dataset["travel_Direction_out"]
+    weather = dataset["Weather_Conditions"]
+    junction_codes = as_array(junction.codes)
+    type_codes = as_array(vehicle_type.codes)
+    in_codes = as_array(direction_in.codes)
+    out_codes = as_array(direction_out.codes)
+    hours = as_array(dataset["timeOfDay"].seconds) // 3600
+    speed_limit = as_array(dataset["JunctionSpeedLimit"].data)
+    speed = as_array(dataset["VehicleSpeed"].data)
+
+    def is_type(*names):
+        return _is_any(vehicle_type, type_codes, names)
+
+    elm = _is_any(junction, junction_codes, (ELM_AVENUE,))
+    hanley = _is_any(junction, junction_codes, (HANLEY_HIGHWAY,))
+    # the two direction columns have their own dictionaries: map "in" codes to
+    # the "out" code of the same string (-1 when the string is never an "out")
+    same_code = np.array(
+        [direction_out.lookup.get(value, -1) for value in direction_in.values],
+        dtype=np.int64,
+    )
+    rain = _is_any(weather, as_array(weather.codes), RAIN_CONDITIONS)
+
+    accumulator = OutcomeAccumulator()
+    accumulator.total = len(hours)
+    accumulator.trucks = int(np.count_nonzero(is_type("Truck")))
+    accumulator.bicycles = int(np.count_nonzero(is_type("Bicycle")))
+    accumulator.over_speed_limit = int(
+        np.count_nonzero(is_type("Car") & (speed > speed_limit))
+    )
+    accumulator.two_wheeled = int(np.count_nonzero(is_type(*TWO_WHEELED_TYPES)))
+    accumulator.electric = int(np.count_nonzero(_bits(dataset["elctricHybrid"])))
+    if len(same_code):
+        accumulator.same_direction = int(
+            np.count_nonzero(same_code[in_codes] == out_codes)
+        )
+    accumulator.elm_vehicles = int(np.count_nonzero(elm))
+    accumulator.elm_scooters = int(np.count_nonzero(elm & is_type("Scooter")))
+    accumulator.buses_north_elm = int(
+        np.count_nonzero(
+            elm & is_type("Bus") & _is_any(direction_out, out_codes, ("North",))
+        )
+    )
+    accumulator.hanley_vehicles = int(np.count_nonzero(hanley))
+    accumulator.hanley_hour_count = ordered_hour_count(hours[hanley])
+    accumulator.rain_hours = set(np.flatnonzero(np.bincount(hours[rain])).tolist())
+    accumulator.hour_count = ordered_hour_count(hours)
+    return accumulator
+
+
+def accumulate(dataset, backend: str = None) -> OutcomeAccumulator:
+    """
+    Returns the OutcomeAccumulator of a TrafficDataset, computed with NumPy when
+    the selected backend is "numpy" and with the single-pass loop otherwise.
+    Both give identical outcomes.
+    """
+    if select_backend(backend) == "numpy":
+        return numpy_accumulator(dataset)
+    return OutcomeAccumulator().add_dataset(dataset)
+
+
+def dataset_hour_count(dataset, idxs) -> dict:
+    """get_hour_count for a TrafficDataset, with bincount over the selected rows."""
+    np = get_numpy()
+    seconds = as_array(dataset["timeOfDay"].seconds)
+    return ordered_hour_count(seconds[np.asarray(idxs, dtype=np.intp)] // 3600)
@@ -1,9 +1,42 @@
-import os
+from traffic_dataset import TrafficDataset
+from traffic_trace import span, traced
 
 # Author: B.G Ranuga Gamage
 # Date: 3/12/2024
 # Student ID: 20231264
 
+# the shared stores are built on first use, so importing this module stays cheap
+OUTCOME_CACHE = None  # cache of outcomes per file contents, see get_outcome_cache
+CATALOG = None  # survey days available in the data directories, see get_catalog
+RESULTS_STORE = None  # append-only log of outcomes per date, see get_results_store
+
+
+def get_outcome_cache():
+    global OUTCOME_CACHE
+    if OUTCOME_CACHE is None:
+        from traffic_outcome_cache import OutcomeCache
+
+        OUTCOME_CACHE = OutcomeCache()
+    return OUTCOME_CACHE
+
+
+def get_catalog():
+    global CATALOG
+    if CATALOG is None:
+        from traffic_catalog import DatasetCatalog
+
+        CATALOG = DatasetCatalog()
+    return CATALOG
+
+
+def get_results_store():
+    global RESULTS_STORE
+    if RESULTS_STORE is None:
+        from traffic_results import ResultsStore
+
+        RESULTS_STORE = ResultsStore()
+    return RESULTS_STORE
+
 
 def date_verification(
     msg, range_check_start, range_check_end, error_message, dtype=int
@@ -76,25 +109,41 @@ def get_csv_file_name(day, month, year) -> str:
 
 
 def valid_path(file_path: str) -> bool:
-    return file_path in os.listdir("./")  # checking if the file exists in the path
+    return (
+        get_catalog().refresh().path_of(file_path) is not None
+    )  # checking if the file exists in one of the data directories
 
 
-def load_csv_file(file_path: str) -> dict:
-    with open(file_path, "r") as file:  # open the file on read mode
-        data = {
-            key: [] for key in file.readline().strip().split(",")
-        }  # add the keys to the dictionary
-        for line in file.readlines():  # read line per line
-            for idx, value in enumerate(
-                line.strip().split(",")
-            ):  # split the line and iterate
-                data[list(data.keys())[idx]].append(
-                    value
-                )  # add the value to the corresponding key
-    return data  # return the finalized dictionary
+def locate_csv_file(file_path: str) -> str:
+    return (
+        get_catalog().path_of(file_path) or file_path
+    )  # the path of the file in the data directories
+
+
+@traced()
+def load_csv_file(file_path: str, columns=None) -> TrafficDataset:
+    from traffic_tokenizer import load_csv
+
+    return load_csv(
+        file_path, columns
+    )  # tokenise the raw bytes straight into the typed columns (all by default)
 
 
 def access_specific_data(data: dict, column: str, equal_value):
+    from traffic_index import get_index, is_indexable
+
+    if isinstance(data, TrafficDataset) and is_indexable(data, column):
+        index = get_index(data)  # bitmap index, built once per dataset
+        return index.rows(
+            index.where(column, equal_value)
+        )  # resolve the filter on the bitmap instead of scanning the column
+    if isinstance(data, TrafficDataset):
+        wanted = {str(value) for value in equal_value}
+        return [
+            idx
+            for idx, iter_value in enumerate(map(str, data[column]))
+            if iter_value in wanted
+        ]  # int columns hold typed values, compare them as the strings of the file
     return [
         idx for idx, iter_value in enumerate(data[column]) if iter_value in equal_value
     ]  # return the finalized list of indexes for the given column
@@ -111,6 +160,10 @@ def get_hour_count(data: dict, idxs: list) -> dict:
     Returns:
     dict: A dictionary where keys are hours (0-23) and values are the count of vehicles for each hour.
     """
+    from traffic_vector import dataset_hour_count, select_backend
+
+    if isinstance(data, TrafficDataset) and select_backend() == "numpy":
+        return dataset_hour_count(data, idxs)  # bincount over the selected rows
     hour_count = {}  # initialize the dictionary
     for idx in idxs:  # iterating over the index
         hour = int(data["timeOfDay"][idx][:2])  # getting the hour from the time
@@ -118,177 +171,75 @@ def get_hour_count(data: dict, idxs: list) -> dict:
     return hour_count  # return the dictionary
 
 
-def process_csv_data(file_path: str) -> dict:
+@traced()
+def process_csv_data(file_path: str, workers: int = None) -> dict:
     """
     Processes the CSV data for the selected date and extracts:
     - Total vehicles
     - Total trucks
     - Total electric vehicles
     - Two-wheeled vehicles, and other requested metrics.
+    Outcomes already computed for the same file contents come from the outcome cache.
+    Large files are parsed on `workers` processes (all cores by default, 1 never).
     """
-    data = load_csv_file(file_path)  # load the data from the file
-    outcomes = {}  # initialize the dictionary for the outcomes
-
-    def count_vehicles(vehicle_types=None):
-        """Counts vehicles of specific types."""
-        if vehicle_types is None:  # no vehicle types specified
-            return len(data["VehicleType"])  # count the vehicles and return the count
-        return len(
-            access_specific_data(data, "VehicleType", vehicle_types)
-        )  # count the vehicles and return the count
-
-    def count_buses_north_elmrabbit():
-        """Counts buses heading north at Elm Avenue/Rabbit Road."""
-        count = 0  # initialize the count
-        for idx in range(
-            len(data["VehicleType"])
-        ):  # iterate through the no of vehicle types
-            if (
-                data["VehicleType"][idx] == "Bus"
-                and data["travel_Direction_out"][idx] == "North"
-                and data["JunctionName"][idx] == "Elm Avenue/Rabbit Road"
-            ):  # check if the vehicle type is busy and the travel direction is north and the junction name is Elm Avenue/Rabbit Road
-                count += 1  # increment the count
-        return count  # return the count
-
-    def count_same_direction_vehicles():
-        """Counts vehicles traveling without turning."""
-        count = 0  # initialize the count
-        for dir_in, dir_out in zip(
-            data["travel_Direction_in"], data["travel_Direction_out"]
-        ):  # iterate over the travel directions in and out
-            if dir_in == dir_out:  # checking if the in and out directions are the same
-                count += 1  # increment the count
-        return count  # return the count
-
-    def count_vehicles_over_speed_limit():
-        """Counts vehicles recorded as over the speed limit."""
-        count = 0  # initialize the count
-        for idx in range(
-            len(data["VehicleType"])
-        ):  # iterate over the idx's of the data
-            if data["VehicleType"][idx] == "Car" and int(
-                data["VehicleSpeed"][idx]
-            ) > int(
-                data["JunctionSpeedLimit"][idx]
-            ):  # checking if the cars speed limit is higher than the speed limit allowed in the junction
-                count += 1  # iterate the count
-        return count  # return the count
-
-    def calculate_percentage(numerator, denominator, dtype=round):
-        """Calculates the percentage, rounded to an integer."""
-        return dtype(
-            numerator / denominator * 100
-        )  # return the rounded up or down value
-
-    def find_peak_traffic_hour(hour_count: dict):
-        """Finds the peak traffic hour(s)."""
-        max_count = max(
-            hour_count.values()
-        )  # get the maximum count of the values in the hour_count dict
-        peak_hours = [
-            hour for hour, count in hour_count.items() if count == max_count
-        ]  # finding the peak hours
-        if len(peak_hours) == 1:  # if the length is 1
-            return f"Between {peak_hours[0]}:00 and {peak_hours[0] + 1}:00"
-        return f"Between {peak_hours[0]}:00 and {peak_hours[-1] + 1}:00"
-
-    # Total vehicle counts
-    total_vehicles = count_vehicles()  # get the total number of vehicle counts
-    outcomes[
-        "The total number of vehicles passing through all junctions for the selected date"
-    ] = total_vehicles
-    outcomes[
-        "The total number of trucks passing through all junctions for the selected date"
-    ] = count_vehicles(["Truck"])
-    outcomes[
-        "The total number of electric vehicles passing through all junctions for the selected date"
-    ] = len(access_specific_data(data, "elctricHybrid", ["True"]))
-    outcomes[
-        "The number of “two wheeled” vehicles through all junctions for the date (bikes, motorbike, scooters)"
-    ] = count_vehicles(["Bicycle", "Motorcycle", "Scooter"])
-
-    # Specific counts and percentages
-    outcomes[
-        "The total number of busses leaving Elm Avenue/Rabbit Road junction heading north"
-    ] = count_buses_north_elmrabbit()
-    outcomes[
-        "The total number of vehicles passing through both junctions without turning left or right"
-    ] = count_same_direction_vehicles()
-    outcomes[
-        "The percentage of all vehicles recorded that are Trucks for the selected date (rounded to an integer)"
-    ] = calculate_percentage(count_vehicles(["Truck"]), total_vehicles)
-    outcomes[
-        "The average number of Bicycles per hour for the selected date (rounded to an integer)"
-    ] = round(count_vehicles(["Bicycle"]) / 24)
-    outcomes[
-        "The total number of vehicles recorded as over the speed limit for the selected date"
-    ] = count_vehicles_over_speed_limit()
-
-    # Elm Avenue and Hanley Highway specific counts
-    elm_avenue_vehicles = len(
-        access_specific_data(data, "JunctionName", ["Elm Avenue/Rabbit Road"])
-    )
-    outcomes[
-        "The total number of vehicles recorded through only Elm Avenue/Rabbit Road junction for the selected date"
-    ] = elm_avenue_vehicles
-    hanley_vehicles = access_specific_data(
-        data, "JunctionName", ["Hanley Highway/Westway"]
-    )
-    outcomes[
-        "The total number of vehicles recorded through only Hanley Highway/Westway junction for the selected date"
-    ] = len(hanley_vehicles)
-    scooter_count = len(
-        [
-            vehicle_type
-            for vehicle_type, junction_name in zip(
-                data["VehicleType"], data["JunctionName"]
-            )
-            if junction_name == "Elm Avenue/Rabbit Road" and vehicle_type == "Scooter"
-        ]
-    )
+    return get_outcome_cache().outcomes(
+        file_path, lambda path, digest: calculate_outcomes(path, digest, workers)
+    )  # only load and compute the data on a cache miss
 
-    outcomes[
-        "The percentage of vehicles through Elm Avenue/Rabbit Road that are Scooters (rounded to integer)"
-    ] = calculate_percentage(scooter_count, elm_avenue_vehicles, int)
-    outcomes[
-        "The number of vehicles recorded in the peak (busiest) hour on Hanley Highway/Westway"
-    ] = max(
-        get_hour_count(
-            data,
-            hanley_vehicles,
-        ).values()
-    )
-    outcomes["The total number of hours of rain on the selected date"] = len(
-        get_hour_count(
-            data,
-            access_specific_data(
-                data, "Weather_Conditions", ["Heavy Rain", "Light Rain"]
-            ),
-        ).values()
-    )
-    # Peak traffic hour calculation
-    hour_count = get_hour_count(data, range(len(data["VehicleType"])))
-    peak_hour = find_peak_traffic_hour(hour_count)
-    outcomes["The peak hour for traffic during the selected date"] = peak_hour
 
-    return outcomes
+def dataset_loader(file_path: str, workers: int = None):
+    """
+    Returns the loader for a cache miss: the parallel byte-range parser when
+    the file is large enough to split, otherwise load_csv_file.
+    """
+    from traffic_parallel import load_csv_file_parallel, should_parallelise
+
+    if should_parallelise(file_path, workers):
+        return lambda path: load_csv_file_parallel(path, workers)
+    return load_csv_file
+
+
+@traced()
+def calculate_outcomes(file_path: str, digest: str = None, workers: int = None) -> dict:
+    """
+    Loads the data and computes every outcome in a single pass over the rows.
+    digest is the SHA-1 of the file when the outcome cache already hashed it.
+    """
+    from traffic_cache import load_cached_dataset
+    from traffic_vector import accumulate, select_backend
+
+    data = load_cached_dataset(
+        file_path, dataset_loader(file_path, workers), digest=digest
+    )  # load the data from the binary cache or the file
+    backend = (
+        select_backend()
+    )  # numpy when installed, unless TRAFFIC_BACKEND says otherwise
+    with span(f"outcomes: {backend}", rows=data.row_count()):
+        accumulator = accumulate(data, backend)  # vectorised or one pass over the rows
+    return accumulator.outcomes()  # build the outcome dictionary
 
 
+def format_outcomes(outcomes: dict) -> list:
+    """
+    Formats the calculated outcomes as one "outcome: value" line each.
+    """
+    return [
+        f"{outcome}: {outcomes[outcome]}" for outcome in outcomes.keys()
+    ]  # build the lines from the keys of the outcomes
+
+
+@traced()
 def display_outcomes(outcomes: dict) -> str:
     """
     Displays the calculated outcomes in a clear and formatted way.
     """
-    tot_str = []  # initialize the list
-    for outcome in outcomes.keys():  # iterate over the keys of the outcomes
-        tot_str.append(
-            f"{outcome}: {outcomes[outcome]}"
-        )  # append the outcome to the list
+    tot_str = format_outcomes(outcomes)  # format the outcomes
     print("\n".join(tot_str))  # print the list
     return tot_str  # return the list
 
 
 # Task C: Save Results to Text File
+@traced()
 def save_results_to_file(outcomes: list, file_name: str = "results.txt") -> None:
     """
     Saves the processed outcomes to a text file and appends if the program loops.
@@ -296,19 +247,40 @@ def save_results_to_file(outcomes: list, file_name: str = "results.txt") -> None
     with open(file_name, "a") as file:  # open the file in append mode
         file.write(
             f"""\n{"*"*25}\n\n"""
-            if open(file_name).read().strip() != ""
+            if file.tell() > 0
             else ""  # write the line if the file is not empty
         )
         file.write("\n".join(outcomes))  # write the outcomes to the file
 
 
-def main():
+def save_results_record(day, month, year, file_path: str, outcomes: dict) -> None:
+    """
+    Appends the outcomes to the structured results log, indexed by date.
+    """
+    import datetime
+
+    get_results_store().append(
+        datetime.date(year, month, day), file_path, outcomes
+    )  # one record per analysed date
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Traffic data outcomes.")
+    parser.add_argument(
+        "--workers", type=int, default=None, help="processes for large files"
+    )
+    args = parser.parse_args(argv)
     while True:  # loop until the user wants to stop
         day, month, year = validate_date_input()  # validate the date input
-        filepath = get_csv_file_name(day, month, year)  # get the file path
-        outcomes = process_csv_data(filepath)  # process the data
+        filepath = locate_csv_file(
+            get_csv_file_name(day, month, year)
+        )  # get the file path
+        outcomes = process_csv_data(filepath, args.workers)  # process the data
         tot_str = display_outcomes(outcomes)  # display the outcomes
         save_results_to_file(tot_str)  # save the outcomes to the file
+        save_results_record(day, month, year, filepath, outcomes)  # and to the log
         if validate_continue_input() == "N":  # check if the user wants to continue
             break  # if not break the loop
 
@@ -4,19 +4,23 @@
 
 from graphics import *
 from w2120198_abc import *
+from traffic_trace import traced
 import math
 
 # Task D: Histogram Display
+HISTOGRAM_COLUMNS = ("timeOfDay", "JunctionName")
 
 
 class HistogramApp:
-    def __init__(self, traffic_data, date):
+    def __init__(self, traffic_data, date, win=None):
         """
         Initializes the histogram application with the traffic data and selected date.
+        win replaces the Tk window, e.g. with a traffic_render.HeadlessWin.
         """
         self.traffic_data = traffic_data
         self.date = date
-        self.win = GraphWin("Vehicle Frequency Histogram", 1080 + 440, 848)
+        self.bars = {}  # (time period, location) -> (bar, count label)
+        self.win = win or GraphWin("Vehicle Frequency Histogram", 1080 + 440, 848)
 
     def setup_window(self):
         """
@@ -41,6 +45,7 @@ class HistogramApp:
             max_height - min_height
         )
 
+    @traced()
     def draw_histogram(self):
         """
         Draws the histogram with axes, labels, and bars.
@@ -55,6 +60,9 @@ class HistogramApp:
         bar_width = 0.45
         gap_between_groups = 0.0875
 
+        bar_coords, bar_colors, keys = [], [], []
+        count_points, count_labels = [], []
+        time_points = []
         for i, time_period in enumerate(time_periods):
             x_base = i * (len(locations) * bar_width + gap_between_groups) + 0.25
 
@@ -63,33 +71,49 @@ class HistogramApp:
                 count = self.traffic_data[time_period][location]
                 bar_height = self.bar_height_calculator(count)
 
-                # Create rectangle for the bar
-                bar_bottom_left = Point(x_base + j * bar_width, 0)
-                bar_top_right = Point(x_base + j * bar_width + bar_width, bar_height)
-                bar = Rectangle(bar_bottom_left, bar_top_right)
-
-                # Alternate colors for different locations
-                bar.setFill("green" if j % 2 == 0 else "red")
-                bar.setOutline("black")
-                bar.draw(self.win)
-
-                # Add count label on top of bar
-                count_text = Text(
-                    Point(x_base + j * bar_width + bar_width / 2, bar_height + 0.5),
-                    str(count),
-                )
-                count_text.setSize(8)
-                count_text.draw(self.win)
-
-                # Add time period label at the bottom
-                if j == 0:
-                    time_label = Text(
-                        Point(x_base + (len(locations) * bar_width) / 2, -1),
-                        time_period,
-                    )
-                    time_label.setSize(8)
-                    time_label.draw(self.win)
+                # Rectangle for the bar, alternate colors for different locations
+                x_left = x_base + j * bar_width
+                bar_coords.append((x_left, 0, x_left + bar_width, bar_height))
+                bar_colors.append("green" if j % 2 == 0 else "red")
+                keys.append((time_period, location))
 
+                # Count label on top of bar
+                count_points.append((x_left + bar_width / 2, bar_height + 0.5))
+                count_labels.append(str(count))
+
+            # Time period label at the bottom
+            time_points.append((x_base + (len(locations) * bar_width) / 2, -1))
+
+        # Create all the items at once, the window is updated a single time
+        with self.win.batch():
+            bars = self.win.drawRectangles(bar_coords, bar_colors, "black")
+            count_texts = self.win.drawTexts(count_points, count_labels, size=8)
+            self.win.drawTexts(time_points, time_periods, size=8)
+        self.bars = dict(zip(keys, zip(bars, count_texts)))
+
+    @traced()
+    def update_histogram(self):
+        """
+        Updates the drawn bars and count labels in place from self.traffic_data,
+        moving the existing canvas items instead of drawing new ones.
+        """
+        for (time_period, location), (bar, count_text) in self.bars.items():
+            count = self.traffic_data[time_period][location]
+            if count_text.getText() == str(count):
+                continue  # nothing changed for this bar
+            bar_height = self.bar_height_calculator(count)
+            bar.p2 = Point(bar.p2.x, bar_height)
+            x1, y1 = self.win.toScreen(bar.p1.x, bar.p1.y)
+            x2, y2 = self.win.toScreen(bar.p2.x, bar.p2.y)
+            self.win.coords(bar.id, x1, y1, x2, y2)
+            count_text.anchor = Point(count_text.anchor.x, bar_height + 0.5)
+            count_text.config["text"] = str(count)
+            x, y = self.win.toScreen(count_text.anchor.x, count_text.anchor.y)
+            self.win.coords(count_text.id, x, y)
+            self.win.itemconfig(count_text.id, text=str(count))
+        self.win.update_idletasks()  # one redraw for all the changes
+
+    @traced()
     def add_legend(self):
         """
         Adds a legend to the histogram to indicate which bar corresponds to which junction.
@@ -131,26 +155,56 @@ class HistogramApp:
         """
         Runs the Tkinter main loop to display the histogram.
         """
-        self.setup_window()
-        self.draw_histogram()
-        self.add_legend()
+        with self.win.batch():
+            self.setup_window()
+            self.draw_histogram()
+            self.add_legend()
+        self.win.getMouse()
+        self.win.close()
+
+    def run_live(self, refresh, interval=1.0):
+        """
+        Runs the histogram and calls refresh() every `interval` seconds on the
+        Tk timer. refresh should update self.traffic_data and return True when
+        it changed, the bars are then updated in place.
+        """
+
+        def tick():
+            if self.win.isClosed():
+                return
+            if refresh():
+                self.update_histogram()
+            self.win.after(int(interval * 1000), tick)
+
+        with self.win.batch():
+            self.setup_window()
+            self.draw_histogram()
+            self.add_legend()
+        tick()
         self.win.getMouse()
         self.win.close()
 
 
 # Task E: Code Loops to Handle Multiple CSV Files
 class MultiCSVProcessor:
-    def __init__(self):
+    def __init__(self, workers=None):
         """
         Initializes the application for processing multiple CSV files.
+        workers is the number of processes large files are parsed on.
         """
         self.current_data = None
+        self.workers = workers
 
+    @traced()
     def load_csv_file(self, file_path):
         """
         Loads a CSV file and processes its data.
         """
-        data = load_csv_file(file_path)
+        from traffic_cache import load_cached_dataset  # the mmap cache, on first load
+
+        data = load_cached_dataset(
+            file_path, load_csv_file, HISTOGRAM_COLUMNS
+        )  # only the two columns the histogram needs are parsed
         features = {}
         for idx, time_of_day in enumerate(data["timeOfDay"]):
             hour = time_of_day.split(":")[0]
@@ -162,6 +216,51 @@ class MultiCSVProcessor:
             features[hour][data["JunctionName"][idx]] += 1
         self.current_data = features
 
+    def follow_csv_file(self, file_path, date, interval=1.0):
+        """
+        Shows a live histogram for a file that is still being written, counting
+        only the rows appended since the previous refresh.
+        """
+        from traffic_follow import TrafficFollower
+
+        self.current_data = {
+            f"{hour:02d}": {
+                "Elm Avenue/Rabbit Road": 0,
+                "Hanley Highway/Westway": 0,
+            }
+            for hour in range(24)
+        }  # every hour is drawn from the start so bars can grow in place
+        follower = TrafficFollower(file_path)
+
+        def add_rows(rows):
+            time_idx = follower.header.index("timeOfDay")
+            junction_idx = follower.header.index("JunctionName")
+            for row in rows:
+                counts = self.current_data.get(row[time_idx].split(":")[0])
+                if counts is not None and row[junction_idx] in counts:
+                    counts[row[junction_idx]] += 1
+
+        follower.listeners.append(add_rows)
+        ha = HistogramApp(self.current_data, date)
+        ha.run_live(lambda: follower.poll() > 0, interval)
+        self.clear_previous_data()
+
+    def show_date_range(self, start, end):
+        """
+        Shows the histogram of a whole date range, built from the per-day cubes.
+        """
+        from traffic_rollup import rollup
+
+        rolled = rollup(start, end)
+        if not rolled.cubes:
+            print(f"No traffic data files between {start:%d/%m/%Y} and {end:%d/%m/%Y}")
+            return
+        display_outcomes(rolled.report())
+        self.current_data = rolled.hourly_junction_counts()
+        ha = HistogramApp(self.current_data, f"{start:%d/%m/%Y} to {end:%d/%m/%Y}")
+        ha.run()
+        self.clear_previous_data()
+
     def clear_previous_data(self):
         """
         Clears data from the previous run to process a new dataset.
@@ -186,10 +285,13 @@ class MultiCSVProcessor:
         """
         while True:  # loop until the user wants to stop
             day, month, year = validate_date_input()  # validate the date input
-            filepath = get_csv_file_name(day, month, year)  # get the file path
-            outcomes = process_csv_data(filepath)  # process the data
+            filepath = locate_csv_file(
+                get_csv_file_name(day, month, year)
+            )  # get the file path
+            outcomes = process_csv_data(filepath, self.workers)  # process the data
             tot_str = display_outcomes(outcomes)  # display the outcomes
             save_results_to_file(tot_str)  # save the outcomes to the file
+            save_results_record(day, month, year, filepath, outcomes)
             self.load_csv_file(filepath)
             ha = HistogramApp(self.current_data, f"{day}/{month}/{year}")
             ha.run()
@@ -200,11 +302,42 @@ class MultiCSVProcessor:
                 break  # if not break the loop
 
 
-def main():
+def main(argv=None):
     """
     Main function to run the application.
     """
-    mcp = MultiCSVProcessor()  # create an instance of MultiCSVProcessor
+    # imported here so the histogram classes load without the command line tools
+    import argparse
+
+    from traffic_batch import parse_date
+    from traffic_rollup import month_range, parse_month, week_range
+
+    parser = argparse.ArgumentParser(description="Traffic data histograms.")
+    parser.add_argument(
+        "--follow", metavar="CSV_FILE", help="show a live histogram of a growing file"
+    )
+    parser.add_argument("--interval", type=float, default=1.0)
+    parser.add_argument("--month", type=parse_month, help="histogram of MM/YYYY")
+    parser.add_argument("--week", type=parse_date, help="histogram of a week")
+    parser.add_argument("--from", dest="start", type=parse_date)
+    parser.add_argument("--to", dest="end", type=parse_date)
+    parser.add_argument(
+        "--workers", type=int, default=None, help="processes for large files"
+    )
+    args = parser.parse_args(argv)
+    mcp = MultiCSVProcessor(args.workers)  # create an instance of MultiCSVProcessor
+    if args.follow:
+        mcp.follow_csv_file(args.follow, args.follow, args.interval)
+        return
+    if args.month or args.week or args.start:
+        if args.month:
+            start, end = month_range(*args.month)
+        elif args.week:
+            start, end = week_range(args.week)
+        else:
+            start, end = args.start, args.end or args.start
+        mcp.show_date_range(start, end)
+        return
     mcp.process_files()  # run the main loop for handling multiple CSV files
 
 